@@ -6,7 +6,9 @@ from setuptools import setup, find_packages
 
 PKG_NAME = "voyager"
 VERSION = "0.1"
-EXTRAS = {}
+EXTRAS = {
+    "msgpack": ["msgpack"],
+}
 
 
 def _read_file(fname):
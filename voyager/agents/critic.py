@@ -1,3 +1,5 @@
+import asyncio
+
 from voyager.prompts import load_prompt
 from voyager.utils.json_utils import fix_and_parse_json
 from langchain_openai.chat_models import ChatOpenAI
@@ -89,16 +91,28 @@ class CriticAgent:
         return success, critique
 
     def ai_check_task_success(self, messages, max_retries=5):
-        if max_retries == 0:
-            print(
-                "\033[31mFailed to parse Critic Agent response. Consider updating your prompt.\033[0m"
-            )
+        if messages[1] is None:
             return False, ""
+        for _ in range(max_retries):
+            result = self.process_ai_message(self.llm.invoke(messages))
+            if result is not None:
+                return result
+        return self.parse_failed()
 
+    async def ai_acheck_task_success(self, messages, max_retries=5):
         if messages[1] is None:
             return False, ""
-
-        critic = self.llm.invoke(messages).content
+        for _ in range(max_retries):
+            result = self.process_ai_message(await self.llm.ainvoke(messages))
+            if result is not None:
+                return result
+        return self.parse_failed()
+
+    def process_ai_message(self, message):
+        """
+        :return: (success, critique), or None when the response has to be asked for again
+        """
+        critic = message.content
         print(f"\033[31m****Critic Agent ai message****\n{critic}\033[0m")
         try:
             response = fix_and_parse_json(critic)
@@ -108,14 +122,15 @@ class CriticAgent:
             return response["success"], response["critique"]
         except Exception as e:
             print(f"\033[31mError parsing critic response: {e} Trying again!\033[0m")
-            return self.ai_check_task_success(
-                messages=messages,
-                max_retries=max_retries - 1,
-            )
+            return None
 
-    def check_task_success(
-        self, *, events, task, context, chest_observation, max_retries=5
-    ):
+    def parse_failed(self):
+        print(
+            "\033[31mFailed to parse Critic Agent response. Consider updating your prompt.\033[0m"
+        )
+        return False, ""
+
+    def render_messages(self, *, events, task, context, chest_observation):
         human_message = self.render_human_message(
             events=events,
             task=task,
@@ -123,11 +138,21 @@ class CriticAgent:
             chest_observation=chest_observation,
         )
 
-        messages = [
+        return [
             self.render_system_message(),
             human_message,
         ]
 
+    def check_task_success(
+        self, *, events, task, context, chest_observation, max_retries=5
+    ):
+        messages = self.render_messages(
+            events=events,
+            task=task,
+            context=context,
+            chest_observation=chest_observation,
+        )
+
         if self.mode == "manual":
             return self.human_check_task_success()
         elif self.mode == "auto":
@@ -136,3 +161,22 @@ class CriticAgent:
             )
         else:
             raise ValueError(f"Invalid critic agent mode: {self.mode}")
+
+    async def acheck_task_success(
+        self, *, events, task, context, chest_observation, max_retries=5
+    ):
+        messages = self.render_messages(
+            events=events,
+            task=task,
+            context=context,
+            chest_observation=chest_observation,
+        )
+
+        if self.mode == "manual":
+            return await asyncio.to_thread(self.human_check_task_success)
+        elif self.mode == "auto":
+            return await self.ai_acheck_task_success(
+                messages=messages, max_retries=max_retries
+            )
+        else:
+            raise ValueError(f"Invalid critic agent mode: {self.mode}")
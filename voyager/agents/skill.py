@@ -58,6 +58,13 @@ class SkillManager:
             programs += f"{primitives}\n\n"
         return programs
 
+    @property
+    def program_entries(self):
+        # same programs as above, one entry per skill for the env program registry
+        return [entry["code"] for entry in self.skills.values()] + list(
+            self.control_primitives
+        )
+
     def add_new_skill(self, info):
         if info["task"].startswith("Deposit useless items into the chest at"):
             # No need to reuse the deposit skill
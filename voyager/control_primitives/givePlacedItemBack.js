@@ -12,6 +12,16 @@ async function givePlacedItemBack(bot, name, position) {
         const x = Math.floor(position.x);
         const y = Math.floor(position.y);
         const z = Math.floor(position.z);
+        // blocks placed through bot.placeBlock are indexed with their position
+        const placed = bot.placements?.nearest(name, new Vec3(x, y, z), 8);
+        if (placed) {
+            await bot.chat(
+                `/setblock ${placed.x} ${placed.y} ${placed.z} air destroy`
+            );
+            bot.placements.remove(name, placed);
+            await bot.waitForTicks(20);
+            return;
+        }
         // loop through 125 blocks around the block
         const size = 3;
         for (let dx = -size; dx <= size; dx++) {
@@ -10,11 +10,33 @@ async function mineBlock(bot, name, count = 1) {
     if (!blockByName) {
         throw new Error(`No block named ${name}`);
     }
-    const blocks = bot.findBlocks({
+    let blocks = bot.findBlocks({
         matching: [blockByName.id],
         maxDistance: 32,
         count: 1024,
     });
+    if (blocks.length === 0 && bot.worldMap) {
+        // walk to where this block was seen before instead of exploring again
+        const known = bot.worldMap.nearest(name, bot.entity.position);
+        if (known.length > 0) {
+            try {
+                await bot.pathfinder.goto(
+                    new GoalNear(known[0].x, known[0].y, known[0].z, 16)
+                );
+            } catch (err) {
+                // the usual message follows if there is still none nearby
+                console.log(`Failed to reach the ${name} seen before: ${err}`);
+            }
+            blocks = bot.findBlocks({
+                matching: [blockByName.id],
+                maxDistance: 32,
+                count: 1024,
+            });
+        }
+    }
+    blocks.forEach((position) => {
+        if (bot.worldMap) bot.worldMap.record(position, blockByName.id);
+    });
     if (blocks.length === 0) {
         bot.chat(`No ${name} nearby, please explore first`);
         _mineBlockFailCount++;
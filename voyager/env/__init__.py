@@ -1 +1,5 @@
 from .bridge import VoyagerEnv
+from .async_bridge import AsyncVoyagerEnv
+from .vec_env import VoyagerVecEnv
+from .replay import ReplayEnv, ReplayDivergence
+from .sim import SimEnv
@@ -0,0 +1,162 @@
+import asyncio
+from typing import Any, Dict, List, Union
+
+import aiohttp
+
+from .bridge import BridgeRequest, BridgeResponse, EventStreamParser, VoyagerEnv
+
+
+class AsyncVoyagerEnv(VoyagerEnv):
+    """
+    VoyagerEnv with awaitable reset/step/close that share one pooled aiohttp session,
+    so mineflayer requests can overlap with LLM calls.
+    Both run the same exchanges with the bridge, see BridgeRequest, so the blocking
+    methods inherited from VoyagerEnv keep working.
+    """
+
+    def __init__(self, *args, connection_limit=8, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connection_limit = connection_limit
+        self._session = None
+        self._session_loop = None
+        self._session_socket = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # a session is bound to the event loop it was created in
+        loop = asyncio.get_running_loop()
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session_loop is not loop
+            or self._session_socket != self.server_socket
+        ):
+            if self._session is not None and not self._session.closed:
+                if self._session_loop is loop:
+                    loop.create_task(self._session.close())
+            if self.server_socket:
+                connector = aiohttp.UnixConnector(
+                    path=self.server_socket, limit=self.connection_limit
+                )
+            else:
+                connector = aiohttp.TCPConnector(limit=self.connection_limit)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._session_loop = loop
+            self._session_socket = self.server_socket
+        return self._session
+
+    async def asend(self, request):
+        async with self.session.post(
+            request.url,
+            json=request.data,
+            headers=request.headers,
+            timeout=aiohttp.ClientTimeout(total=request.timeout),
+        ) as res:
+            content = await res.read()
+            return BridgeResponse(
+                res.status, res.headers.get("Content-Type", ""), content, res.headers
+            )
+
+    async def arun_exchange(self, exchange):
+        """
+        Async counterpart of VoyagerEnv.run_exchange, blocking calls run in a worker
+        thread.
+        """
+        result = None
+        while True:
+            try:
+                operation = exchange.send(result)
+            except StopIteration as stop:
+                return stop.value
+            if isinstance(operation, BridgeRequest):
+                result = await self.asend(operation)
+            else:
+                result = await asyncio.to_thread(operation.function, *operation.args)
+
+    async def acheck_process(self):
+        return await self.arun_exchange(self.check_process_exchange())
+
+    async def astart(self):
+        return await self.arun_exchange(self.start_exchange())
+
+    async def aupload_programs(self, programs: List[str]) -> List[str]:
+        return await self.arun_exchange(self.upload_programs_exchange(programs))
+
+    async def astep(
+        self,
+        code: str,
+        programs: Union[str, List[str]] = "",
+        observation: Dict[str, Any] = None,
+        movements: Dict[str, Any] = None,
+    ):
+        return await self.arun_exchange(
+            self.step_exchange(code, programs, observation, movements)
+        )
+
+    async def astream_step(
+        self,
+        code: str,
+        programs: Union[str, List[str]] = "",
+        observation: Dict[str, Any] = None,
+    ):
+        """
+        Async counterpart of VoyagerEnv.stream_step.
+        """
+        data = await self.arun_exchange(
+            self.step_data_exchange(code, programs, observation, stream=True)
+        )
+        for retried in (False, True):
+            async with self.session.post(
+                f"{self.bot_server}/step",
+                json=data,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            ) as res:
+                if not retried and self.lost_programs(res.status, programs):
+                    await self.arun_exchange(
+                        self.reupload_programs_exchange(data, programs)
+                    )
+                    continue
+                if res.status != 200:
+                    raise RuntimeError("Failed to step Minecraft server")
+                parser = EventStreamParser()
+                try:
+                    async for line in res.content:
+                        event = parser.feed(line.decode("utf-8").rstrip("\r\n"))
+                        if event is not None:
+                            yield event
+                        if parser.done:
+                            break
+                finally:
+                    # mineflayer pauses the server once the step ends, even when
+                    # the consumer stopped reading early
+                    self.server_paused = True
+            break
+
+    async def acancel(self):
+        return await self.arun_exchange(self.cancel_exchange())
+
+    async def arollback_placed(self, observation: Dict[str, Any] = None):
+        return await self.arun_exchange(self.rollback_placed_exchange(observation))
+
+    async def anearest_blocks(self, name: str, count=1, max_distance=None):
+        return await self.arun_exchange(
+            self.nearest_blocks_exchange(name, count, max_distance)
+        )
+
+    async def areset(self, *, seed=None, options=None):
+        return await self.arun_exchange(self.reset_exchange(options))
+
+    async def aclose(self):
+        closed = await self.arun_exchange(self.close_exchange())
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        return closed
+
+    async def aset_paused(self, paused):
+        return await self.arun_exchange(self.set_paused_exchange(paused))
+
+    async def apause(self):
+        return await self.aset_paused(True)
+
+    async def aunpause(self):
+        return await self.aset_paused(False)
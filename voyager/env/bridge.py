@@ -1,11 +1,20 @@
+import hashlib
 import os.path
+import re
+import sys
 import time
 import warnings
-from typing import SupportsFloat, Any, Tuple, Dict
+from urllib.parse import quote
+from typing import SupportsFloat, Any, Tuple, Dict, List, Union
 
 import requests
 import json
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 import gymnasium as gym
 from gymnasium.core import ObsType
 
@@ -13,6 +22,74 @@ import voyager.utils as U
 
 from .minecraft_launcher import MinecraftInstance
 from .process_monitor import SubprocessMonitor
+from .unix_socket import UnixSocketAdapter
+
+
+class EventStreamParser:
+    """
+    Incremental parser for the server-sent events of a streamed step.
+    """
+
+    def __init__(self):
+        self.event_name = None
+        self.data = []
+        self.done = False
+
+    def feed(self, line):
+        """
+        :return: the event completed by this line, if any
+        """
+        if line:
+            if line.startswith("event:"):
+                self.event_name = line[len("event:") :].strip()
+            elif line.startswith("data:"):
+                self.data.append(line[len("data:") :].strip())
+            return None
+        event_name, data = self.event_name, self.data
+        self.event_name, self.data = None, []
+        if event_name == "end":
+            self.done = True
+            return None
+        if data:
+            return json.loads("\n".join(data))
+        return None
+
+
+class BridgeRequest:
+    """
+    A POST to the mineflayer bridge.
+
+    Every exchange with the bridge is written once, as a generator method of
+    VoyagerEnv named *_exchange that yields BridgeRequests and BlockingCalls,
+    is sent back a BridgeResponse or the result of the call, and returns its
+    result. VoyagerEnv.run_exchange runs it with blocking requests and
+    AsyncVoyagerEnv.arun_exchange with aiohttp.
+    """
+
+    def __init__(self, url, data=None, headers=None, timeout=None):
+        self.url = url
+        self.data = data
+        self.headers = headers
+        self.timeout = timeout
+
+
+class BridgeResponse:
+    def __init__(self, status, content_type, content, headers):
+        self.status = status
+        self.content_type = content_type
+        self.content = content
+        self.headers = headers
+
+
+class BlockingCall:
+    """
+    A blocking call in an exchange, like starting a process, that
+    AsyncVoyagerEnv runs in a worker thread.
+    """
+
+    def __init__(self, function, *args):
+        self.function = function
+        self.args = args
 
 
 class VoyagerEnv(gym.Env):
@@ -24,8 +101,18 @@ class VoyagerEnv(gym.Env):
         server_port=3000,
         request_timeout=600,
         log_path="./logs",
+        use_msgpack=False,
+        bot_name="bot",
+        shared_bridge=False,
+        step_max_ticks=None,
+        step_max_seconds=None,
+        standby_port=None,
+        observation_profile=None,
+        collect_metadata=False,
+        mock_bridge=False,
+        server_socket=None,
     ):
-        if not mc_port and not azure_login:
+        if not mc_port and not azure_login and not mock_bridge:
             raise ValueError("Either mc_port or azure_login must be specified")
         if mc_port and azure_login:
             warnings.warn(
@@ -33,11 +120,42 @@ class VoyagerEnv(gym.Env):
             )
         self.mc_port = mc_port
         self.azure_login = azure_login
-        self.server = f"{server_host}:{server_port}"
+        self.server_host = server_host
         self.server_port = server_port
+        # one keep-alive session for all requests to the bridge, over a unix domain
+        # socket instead of tcp when server_socket is set
+        self.http = requests.Session()
+        self.server_socket = None
+        self.set_server(server_socket=server_socket)
         self.request_timeout = request_timeout
+        # mineflayer aborts a program that runs past these budgets and still returns
+        # the observation, so the wall budget stays below request_timeout
+        self.step_max_ticks = step_max_ticks
+        self.step_max_seconds = (
+            step_max_seconds if step_max_seconds is not None else request_timeout * 0.9
+        )
         self.log_path = log_path
-        self.mineflayer = self.get_mineflayer_process(server_port)
+        if use_msgpack and msgpack is None:
+            raise ImportError("use_msgpack requires the msgpack package")
+        # observations come back as msgpack instead of json if asked for
+        self.response_headers = (
+            {"Accept": "application/msgpack"} if use_msgpack else {}
+        )
+        self.bot_name = bot_name
+        # serve requests from the scripted world in mock_bridge.py instead of
+        # mineflayer, for benchmarking without Minecraft or node
+        self.mock_bridge = mock_bridge
+        # default observation profile sent on reset, see build_step_data
+        self.observation_profile = observation_profile
+        # attach to a mineflayer bridge that is shared with other bots instead of
+        # owning a node process
+        self.shared_bridge = shared_bridge
+        if shared_bridge:
+            self.mineflayer = None
+        else:
+            self.mineflayer = self.get_mineflayer_process(
+                server_socket or server_port, standby_port
+            )
         if azure_login:
             self.mc_instance = self.get_mc_instance()
         else:
@@ -46,21 +164,57 @@ class VoyagerEnv(gym.Env):
         self.reset_options = None
         self.connected = False
         self.server_paused = False
+        # hashes of the programs the running mineflayer process already holds
+        self.uploaded_programs = set()
+        # milliseconds mineflayer spent setting up the last step before running code
+        self.step_setup_ms = None
+        # with collect_metadata, mineflayer also reports the time spent in each phase
+        # of a request and in each control primitive, kept in last_metadata
+        self.collect_metadata = collect_metadata
+        self.last_metadata = None
 
-    def get_mineflayer_process(self, server_port):
+    def get_mineflayer_process(self, server_port, standby_port=None):
+        """
+        :param server_port: port the bridge listens on, or the path of its unix socket
+        :param standby_port: port or socket path of the standby bridge
+        """
         U.f_mkdir(self.log_path, "mineflayer")
         file_path = os.path.abspath(os.path.dirname(__file__))
+        if self.mock_bridge:
+            command = [sys.executable, U.f_join(file_path, "mock_bridge.py")]
+        else:
+            command = ["node", U.f_join(file_path, "mineflayer/index.js")]
         return SubprocessMonitor(
-            commands=[
-                "node",
-                U.f_join(file_path, "mineflayer/index.js"),
-                str(server_port),
-            ],
+            commands=command + [str(server_port)],
             name="mineflayer",
-            ready_match=r"Server started on port (\d+)",
+            ready_match=r"Server started on (?:port (\d+)|socket (\S+))",
             log_path=U.f_join(self.log_path, "mineflayer"),
+            # with a standby port, a second bridge is kept booted to take over on failure
+            standby_commands=(
+                command + [str(standby_port)] if standby_port else None
+            ),
         )
 
+    def set_server(self, server_port=None, server_socket=None):
+        if server_port is not None:
+            self.server_port = server_port
+        if server_socket is not None and server_socket != self.server_socket:
+            self.server_socket = server_socket
+            # the host is only used for mounting the adapter and the Host header
+            self.http.mount("http://mineflayer/", UnixSocketAdapter(server_socket))
+        if self.server_socket:
+            self.server = "http://mineflayer"
+        else:
+            self.server = f"{self.server_host}:{self.server_port}"
+
+    def update_server_port(self):
+        # after a standby took over, the bridge listens on the standby's port or socket
+        match = re.search(self.mineflayer.ready_match, self.mineflayer.ready_line)
+        if match and match.group(1):
+            self.set_server(server_port=int(match.group(1)))
+        elif match:
+            self.set_server(server_socket=match.group(2))
+
     def get_mc_instance(self):
         print("Creating Minecraft server")
         U.f_mkdir(self.log_path, "minecraft")
@@ -70,20 +224,60 @@ class VoyagerEnv(gym.Env):
             log_path=U.f_join(self.log_path, "minecraft"),
         )
 
-    def check_process(self):
+    @property
+    def bot_server(self):
+        return f"{self.server}/bots/{quote(self.bot_name, safe='')}"
+
+    @property
+    def bridge_running(self):
+        # a shared bridge is managed outside of this env
+        return self.mineflayer is None or self.mineflayer.is_running
+
+    def send(self, request):
+        res = self.http.post(
+            request.url,
+            json=request.data,
+            headers=request.headers,
+            timeout=request.timeout,
+        )
+        return BridgeResponse(
+            res.status_code, res.headers.get("Content-Type", ""), res.content, res.headers
+        )
+
+    def run_exchange(self, exchange):
+        """
+        Run an exchange with the bridge, see BridgeRequest, blocking on every request.
+        :return: what the exchange returns
+        """
+        result = None
+        while True:
+            try:
+                operation = exchange.send(result)
+            except StopIteration as stop:
+                return stop.value
+            if isinstance(operation, BridgeRequest):
+                result = self.send(operation)
+            else:
+                result = operation.function(*operation.args)
+
+    def check_process_exchange(self):
         if self.mc_instance and not self.mc_instance.is_running:
             # if self.mc_instance:
             #     self.mc_instance.check_process()
             #     if not self.mc_instance.is_running:
             print("Starting Minecraft server")
-            self.mc_instance.run()
+            yield BlockingCall(self.mc_instance.run)
             self.mc_port = self.mc_instance.port
             self.reset_options["port"] = self.mc_instance.port
             print(f"Server started on port {self.reset_options['port']}")
         retry = 0
-        while not self.mineflayer.is_running:
-            print("Mineflayer process has exited, restarting")
-            self.mineflayer.run()
+        while not self.bridge_running:
+            if (yield BlockingCall(self.mineflayer.promote_standby)):
+                print("Mineflayer process has exited, switching to standby")
+            else:
+                print("Mineflayer process has exited, restarting")
+                yield BlockingCall(self.mineflayer.run)
+            self.uploaded_programs = set()
             if not self.mineflayer.is_running:
                 if retry >= 3:
                     raise RuntimeError("Mineflayer process failed to start")
@@ -91,56 +285,357 @@ class VoyagerEnv(gym.Env):
                     retry += 1
                     continue
             print(self.mineflayer.ready_line)
-            res = requests.post(
-                f"{self.server}/start",
-                json=self.reset_options,
+            self.update_server_port()
+            return (yield from self.start_exchange())
+        return None
+
+    def start_exchange(self):
+        # a bridge that was restarted does not know whether the server is paused
+        self.reset_options["paused"] = self.server_paused
+        res = yield BridgeRequest(
+            f"{self.bot_server}/start",
+            self.reset_options,
+            headers=self.response_headers,
+            timeout=self.request_timeout,
+        )
+        if res.status != 200:
+            if self.mineflayer is not None:
+                self.mineflayer.stop()
+            raise RuntimeError(f"Minecraft server reply with code {res.status}")
+        self.server_paused = True
+        return self.parse_response(res)
+
+    def check_process(self):
+        return self.run_exchange(self.check_process_exchange())
+
+    def start(self):
+        return self.run_exchange(self.start_exchange())
+
+    def parse_response(self, res):
+        return self.decode_response(res.content_type, res.content)
+
+    def decode_response(self, content_type, content):
+        if content_type.startswith("application/msgpack"):
+            return self.unwrap_events(msgpack.unpackb(content, raw=False))
+        data = json.loads(content)
+        if isinstance(data, str):
+            # older bridges send the observation as a json encoded string
+            data = json.loads(data)
+        return self.unwrap_events(data)
+
+    def unwrap_events(self, data):
+        if isinstance(data, dict) and "events" in data:
+            self.last_metadata = data.get("metadata")
+            data = data["events"]
+        # events of the delta observation profile are rebuilt lazily
+        return U.decode_events(data)
+
+    def hash_programs(self, programs: List[str]):
+        """
+        :return: content hashes of all programs, and the programs not uploaded yet
+        """
+        hashes = []
+        missing = {}
+        for program in programs:
+            program_hash = hashlib.sha256(program.encode("utf-8")).hexdigest()
+            hashes.append(program_hash)
+            if program_hash not in self.uploaded_programs:
+                missing[program_hash] = program
+        return hashes, missing
+
+    def upload_programs_exchange(self, programs: List[str]):
+        hashes, missing = self.hash_programs(programs)
+        if missing:
+            res = yield BridgeRequest(
+                f"{self.server}/programs",
+                {"programs": missing},
                 timeout=self.request_timeout,
             )
-            if res.status_code != 200:
-                self.mineflayer.stop()
-                raise RuntimeError(
-                    f"Minecraft server reply with code {res.status_code}"
-                )
-            return res.json()
+            if res.status != 200:
+                raise RuntimeError("Failed to upload programs to Minecraft server")
+            self.uploaded_programs.update(missing)
+        return hashes
 
-    def step(
+    def upload_programs(self, programs: List[str]) -> List[str]:
+        """
+        Upload the programs the mineflayer server has not seen yet.
+        :return: content hashes of all programs, in order
+        """
+        return self.run_exchange(self.upload_programs_exchange(programs))
+
+    @property
+    def step_budget(self):
+        budget = {}
+        if self.step_max_ticks:
+            budget["max_ticks"] = self.step_max_ticks
+        if self.step_max_seconds:
+            budget["max_ms"] = int(self.step_max_seconds * 1000)
+        return budget
+
+    @staticmethod
+    def build_step_data(
+        code: str,
+        observation: Dict[str, Any] = None,
+        movements: Dict[str, Any] = None,
+        **extra,
+    ):
+        """
+        :param movements: rebuild the pathfinder movements with these properties set,
+        e.g. {"canDig": False}. They are kept for later steps.
+        :param observation: observation profile for this step, with the optional keys
+        observers (observations to compute), events (event names to record besides the
+        final observe), voxel_radius, changed_only (intermediate events only carry
+        observations that changed) and delta (events come back as U.DeltaEvents, with
+        all but the last event diff encoded)
+        """
+        data = {"code": code, **extra}
+        if observation:
+            data["observation"] = observation
+        if movements is not None:
+            data["movements"] = movements
+        return data
+
+    def step_data_exchange(
         self,
         code: str,
-        programs: str = "",
-    ) -> Tuple[ObsType, SupportsFloat, bool, bool, Dict[str, Any]]:
+        programs: Union[str, List[str]] = "",
+        observation: Dict[str, Any] = None,
+        movements: Dict[str, Any] = None,
+        stream=False,
+    ):
+        """
+        Restart the bridge if needed and build the body of a /step request, uploading
+        the programs the bridge does not hold yet.
+        """
         if not self.has_reset:
             raise RuntimeError("Environment has not been reset yet")
-        self.check_process()
-        self.unpause()
-        data = {
-            "code": code,
-            "programs": programs,
-        }
-        res = requests.post(
-            f"{self.server}/step", json=data, timeout=self.request_timeout
+        yield from self.check_process_exchange()
+        data = self.build_step_data(
+            code,
+            observation,
+            movements,
+            metadata=self.collect_metadata,
+            # mineflayer unpauses the server itself and pauses it again after replying
+            pause_after=True,
+            **self.step_budget,
+        )
+        if stream:
+            data["stream"] = True
+        if isinstance(programs, str):
+            data["programs"] = programs
+        else:
+            data["program_hashes"] = yield from self.upload_programs_exchange(programs)
+        return data
+
+    @staticmethod
+    def lost_programs(status, programs: Union[str, List[str]]):
+        # mineflayer lost its registry, everything has to be uploaded again
+        return status == 409 and not isinstance(programs, str)
+
+    def reupload_programs_exchange(self, data, programs: List[str]):
+        self.uploaded_programs = set()
+        data["program_hashes"] = yield from self.upload_programs_exchange(programs)
+
+    def step_request(self, data):
+        return BridgeRequest(
+            f"{self.bot_server}/step",
+            data,
+            headers=self.response_headers,
+            timeout=self.request_timeout,
         )
+
+    def step_exchange(
+        self,
+        code: str,
+        programs: Union[str, List[str]] = "",
+        observation: Dict[str, Any] = None,
+        movements: Dict[str, Any] = None,
+    ):
+        data = yield from self.step_data_exchange(code, programs, observation, movements)
+        res = yield self.step_request(data)
+        if self.lost_programs(res.status, programs):
+            yield from self.reupload_programs_exchange(data, programs)
+            res = yield self.step_request(data)
+        if res.status != 200:
+            raise RuntimeError("Failed to step Minecraft server")
+        self.step_setup_ms = self.read_setup_ms(res.headers)
+        returned_data = self.parse_response(res)
+        self.server_paused = True
+        return returned_data
+
+    @staticmethod
+    def read_setup_ms(headers):
+        setup_ms = headers.get("X-Step-Setup-Ms")
+        return float(setup_ms) if setup_ms is not None else None
+
+    def step(
+        self,
+        code: str,
+        programs: Union[str, List[str]] = "",
+        observation: Dict[str, Any] = None,
+        movements: Dict[str, Any] = None,
+    ) -> Tuple[ObsType, SupportsFloat, bool, bool, Dict[str, Any]]:
+        return self.run_exchange(
+            self.step_exchange(code, programs, observation, movements)
+        )
+
+    def post_stream(self, data):
+        return self.http.post(
+            f"{self.bot_server}/step",
+            json=data,
+            timeout=self.request_timeout,
+            stream=True,
+        )
+
+    def stream_step(
+        self,
+        code: str,
+        programs: Union[str, List[str]] = "",
+        observation: Dict[str, Any] = None,
+    ):
+        """
+        Same as step, but yields every event as soon as mineflayer records it instead of
+        waiting for the program to finish. The last event is the final observe.
+        """
+        data = self.run_exchange(
+            self.step_data_exchange(code, programs, observation, stream=True)
+        )
+        res = self.post_stream(data)
+        if self.lost_programs(res.status_code, programs):
+            res.close()
+            self.run_exchange(self.reupload_programs_exchange(data, programs))
+            res = self.post_stream(data)
         if res.status_code != 200:
+            res.close()
             raise RuntimeError("Failed to step Minecraft server")
-        returned_data = res.json()
-        self.pause()
-        return json.loads(returned_data)
+        parser = EventStreamParser()
+        try:
+            for line in res.iter_lines(decode_unicode=True):
+                event = parser.feed(line)
+                if event is not None:
+                    yield event
+                if parser.done:
+                    break
+        finally:
+            res.close()
+            # mineflayer pauses the server once the step ends, even when the
+            # consumer stopped reading early
+            self.server_paused = True
+
+    def cancel_exchange(self):
+        res = yield BridgeRequest(
+            f"{self.bot_server}/cancel", timeout=self.request_timeout
+        )
+        if res.status != 200:
+            raise RuntimeError("Failed to cancel Minecraft server step")
+        return json.loads(res.content)["cancelled"]
+
+    def cancel(self):
+        """
+        Abort the program the bot is running. The pending step still returns the
+        observation, with the cancellation reported as an error event.
+        """
+        return self.run_exchange(self.cancel_exchange())
+
+    def rollback_placed_exchange(self, observation: Dict[str, Any] = None):
+        if not self.has_reset:
+            raise RuntimeError("Environment has not been reset yet")
+        data = {"metadata": self.collect_metadata, "pause_after": True}
+        if observation:
+            data["observation"] = observation
+        res = yield BridgeRequest(
+            f"{self.bot_server}/rollback",
+            data,
+            headers=self.response_headers,
+            timeout=self.request_timeout,
+        )
+        if res.status != 200:
+            raise RuntimeError("Failed to roll back placed blocks")
+        returned_data = self.parse_response(res)
+        self.server_paused = True
+        return returned_data
+
+    def rollback_placed(self, observation: Dict[str, Any] = None):
+        """
+        Take the blocks the last step placed back out of the world and give them back
+        to the bot, without running any code.
+        :param observation: observation profile of the answer, by default its only
+        event has the inventory and voxels after the rollback
+        :return: events after the rollback
+        """
+        return self.run_exchange(self.rollback_placed_exchange(observation))
+
+    def nearest_blocks_exchange(self, name: str, count=1, max_distance=None):
+        data = {"name": name, "count": count}
+        if max_distance is not None:
+            data["max_distance"] = max_distance
+        res = yield BridgeRequest(
+            f"{self.bot_server}/nearest", data, timeout=self.request_timeout
+        )
+        if res.status != 200:
+            raise RuntimeError("Failed to query Minecraft server world map")
+        return json.loads(res.content)["positions"]
+
+    def nearest_blocks(self, name: str, count=1, max_distance=None):
+        """
+        :return: positions of the closest blocks named name that the bot has seen this
+        session, nearest first
+        """
+        return self.run_exchange(self.nearest_blocks_exchange(name, count, max_distance))
 
     def render(self):
         raise NotImplementedError("render is not implemented")
 
+    def reset_exchange(self, options=None):
+        self.reset_options = self.build_reset_options(options)
+        self.bot_name = self.reset_options["bot_name"]
+
+        if self.shared_bridge or self.can_soft_reset:
+            # check_process only starts the bot itself if node had to be restarted
+            returned_data = yield from self.check_process_exchange()
+            if not returned_data:
+                returned_data = yield from self.start_exchange()
+        else:
+            # the server must not stay paused once this bridge is gone
+            yield from self.set_paused_exchange(False)
+            self.mineflayer.stop()
+            yield BlockingCall(time.sleep, 1)  # wait for mineflayer to exit
+            returned_data = yield from self.check_process_exchange()
+        self.has_reset = True
+        self.connected = True
+        # All the reset in step will be soft, and keep the time of the world
+        self.reset_options["reset"] = "soft"
+        self.reset_options["time"] = None
+        return returned_data
+
     def reset(
         self,
         *,
         seed=None,
         options=None,
     ) -> Tuple[ObsType, Dict[str, Any]]:
+        return self.run_exchange(self.reset_exchange(options))
+
+    @property
+    def can_soft_reset(self):
+        """
+        A soft reset reuses the running node process, and mineflayer reuses the
+        connected bot as well, so only a crash needs a full restart.
+        """
+        return (
+            self.reset_options["reset"] == "soft"
+            and self.connected
+            and self.bridge_running
+        )
+
+    def build_reset_options(self, options=None):
         if options is None:
             options = {}
 
         if options.get("inventory", {}) and options.get("mode", "hard") != "hard":
             raise RuntimeError("inventory can only be set when options is hard")
 
-        self.reset_options = {
+        return {
             "port": self.mc_port,
             "reset": options.get("mode", "hard"),
             "inventory": options.get("inventory", {}),
@@ -148,44 +643,52 @@ class VoyagerEnv(gym.Env):
             "spread": options.get("spread", False),
             "waitTicks": options.get("wait_ticks", 5),
             "position": options.get("position", None),
-            "bot_name": options.get("bot_name", "bot"),
+            "bot_name": options.get("bot_name", self.bot_name),
+            # default observation profile of the bot, see build_step_data
+            "observation": options.get("observation", self.observation_profile),
+            "metadata": self.collect_metadata,
+            "pause_after": True,
+            # world setup before the observation of the reset, see setupWorld
+            "time": options.get("time", None),
+            "difficulty": options.get("difficulty", None),
+            "gamerules": options.get("gamerules", {}),
         }
 
-        self.unpause()
-        self.mineflayer.stop()
-        time.sleep(1)  # wait for mineflayer to exit
-
-        returned_data = self.check_process()
-        self.has_reset = True
-        self.connected = True
-        # All the reset in step will be soft
-        self.reset_options["reset"] = "soft"
-        self.pause()
-        return json.loads(returned_data)
-
-    def close(self):
-        self.unpause()
+    def close_exchange(self):
         if self.connected:
-            res = requests.post(f"{self.server}/stop")
-            if res.status_code == 200:
+            # mineflayer unpauses the server before the bot leaves
+            res = yield BridgeRequest(f"{self.bot_server}/stop")
+            if res.status == 200:
                 self.connected = False
+                self.server_paused = False
         if self.mc_instance:
             self.mc_instance.stop()
-        self.mineflayer.stop()
+        if self.mineflayer is not None:
+            self.mineflayer.stop()
+            self.mineflayer.stop_standby()
         return not self.connected
 
-    def pause(self):
-        if self.mineflayer.is_running and not self.server_paused:
-            res = requests.post(f"{self.server}/pause")
-            if res.status_code == 200:
-                self.server_paused = True
-        return self.server_paused
+    def close(self):
+        return self.run_exchange(self.close_exchange())
 
-    def unpause(self):
-        if self.mineflayer.is_running and self.server_paused:
-            res = requests.post(f"{self.server}/pause")
-            if res.status_code == 200:
-                self.server_paused = False
+    def set_paused_exchange(self, paused):
+        if self.bridge_running and self.server_paused != paused:
+            res = yield BridgeRequest(f"{self.bot_server}/pause", {"paused": paused})
+            if res.status == 200:
+                self.server_paused = json.loads(res.content)["paused"]
             else:
-                print(res.json())
+                print(json.loads(res.content))
         return self.server_paused
+
+    def set_paused(self, paused):
+        """
+        Pause or unpause the server. Steps and resets already leave it paused, so
+        this is only needed to let the world run between them.
+        """
+        return self.run_exchange(self.set_paused_exchange(paused))
+
+    def pause(self):
+        return self.set_paused(True)
+
+    def unpause(self):
+        return self.set_paused(False)
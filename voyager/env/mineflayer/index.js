@@ -1,10 +1,26 @@
 const fs = require("fs");
+const { AsyncLocalStorage } = require("async_hooks");
 const express = require("express");
 const bodyParser = require("body-parser");
 const mineflayer = require("mineflayer");
 
 const skills = require("./lib/skillLoader");
 const { initCounter, getNextTime } = require("./lib/utils");
+const { ProgramRegistry } = require("./lib/programRegistry");
+const { CODE_FILENAME, getSkillContext } = require("./lib/skillContext");
+const { Execution } = require("./lib/execution");
+const { getWorldMap } = require("./lib/worldMap");
+const { configureMovements } = require("./lib/pathfinding");
+const { Timing } = require("./lib/timing");
+const { getQuiescence } = require("./lib/quiescence");
+const {
+    encodeData,
+    wrapEncoded,
+    sendEncoded,
+    startEventStream,
+    writeStreamEvent,
+    endEventStream,
+} = require("./lib/encoding");
 const obs = require("./lib/observation/base");
 const OnChat = require("./lib/observation/onChat");
 const OnError = require("./lib/observation/onError");
@@ -15,17 +31,68 @@ const OnSave = require("./lib/observation/onSave");
 const Chests = require("./lib/observation/chests");
 const { plugin: tool } = require("mineflayer-tool");
 
-let bot = null;
+// One bridge process can host many bots, keyed by bot_name
+const bots = new Map();
+let lastBotName = null;
+// Programs are content-addressed, so the registry is shared by all bots
+const programRegistry = new ProgramRegistry();
+
+// Uncaught errors are handed to the step whose code raised them: every
+// evaluateCode runs in a context that holds the handler of its step
+const stepErrorHandlers = new AsyncLocalStorage();
+process.on("uncaughtException", (err) => {
+    const onError = stepErrorHandlers.getStore();
+    if (onError) {
+        onError(err);
+        return;
+    }
+    // mineflayer's tick and packet callbacks, and bot.on listeners of the
+    // program, run outside that context: their errors go to every step
+    // running right now
+    const running = Array.from(bots.values())
+        .map((bot) => bot.execution)
+        .filter((execution) => execution && execution.onError);
+    if (running.length > 0) {
+        running.forEach((execution) => execution.onError(err));
+    } else {
+        console.log("Uncaught Error outside of a step");
+        console.log(err.stack || err);
+    }
+});
 
 const app = express();
+const router = express.Router({ mergeParams: true });
 
 app.use(bodyParser.json({ limit: "50mb" }));
 app.use(bodyParser.urlencoded({ limit: "50mb", extended: false }));
 
-app.post("/start", (req, res) => {
-    if (bot) onDisconnect("Restarting bot");
-    bot = null;
+// Routes under /bots/:botName address a single bot, the bare routes fall back
+// to the bot_name in the body or the last started bot.
+function getBotName(req) {
+    return req.params.botName || req.body.bot_name || lastBotName;
+}
+
+function getBot(req, res) {
+    const bot = bots.get(getBotName(req));
+    if (!bot) {
+        res.status(400).json({ error: "Bot not spawned" });
+        return null;
+    }
+    return bot;
+}
+
+router.post("/start", (req, res) => {
+    const botName = req.params.botName || req.body.bot_name || "bot";
+    let bot = bots.get(botName);
     console.log(req.body);
+    // a soft reset keeps the connected bot and only forgets what it observed
+    if (bot && req.body.reset === "soft" && canReuseBot(bot, req.body)) {
+        softReset(bot, req, res);
+        return;
+    }
+    if (bot) {
+        onDisconnect("Restarting bot");
+    }
     bot = mineflayer.createBot({
         host: "localhost", // minecraft server ip
         port: req.body.port, // minecraft server port
@@ -33,6 +100,13 @@ app.post("/start", (req, res) => {
         disableChatSigning: true,
         checkTimeoutInterval: 60 * 60 * 1000,
     });
+    const timing = new Timing(bot);
+    timing.phase("connect");
+    bot.mcPort = req.body.port;
+    // whether the server is paused, as far as the client knows after a crash
+    getServer(bot.mcPort, Boolean(req.body.paused));
+    bots.set(botName, bot);
+    lastBotName = botName;
     bot.once("error", onConnectionFailed);
 
     // Event subscriptions
@@ -51,6 +125,11 @@ app.post("/start", (req, res) => {
 
     bot.once("spawn", async () => {
         bot.removeListener("error", onConnectionFailed);
+        timing.phase("prepare");
+        // count the reset commands below as pending, so the settle waits
+        // for their answers and not only for a couple of quiet ticks
+        skills.injectChat(bot);
+        const releaseWorld = holdWorld(bot);
         let itemTicks = 1;
         if (req.body.reset === "hard") {
             bot.chat("/clear @s");
@@ -87,6 +166,7 @@ app.post("/start", (req, res) => {
                 `/tp @s ${req.body.position.x} ${req.body.position.y} ${req.body.position.z}`
             );
         }
+        setupWorld(bot, req.body, DEFAULT_GAMERULES);
 
         // if iron_pickaxe is in bot's inventory
         if (
@@ -95,6 +175,7 @@ app.post("/start", (req, res) => {
             bot.iron_pickaxe = true;
         }
 
+        timing.phase("plugins");
         const { pathfinder } = require("mineflayer-pathfinder");
         const tool = require("mineflayer-tool").plugin;
         const collectBlock = require("mineflayer-collectblock").plugin;
@@ -105,6 +186,7 @@ app.post("/start", (req, res) => {
         bot.loadPlugin(collectBlock);
         bot.loadPlugin(pvp);
         bot.loadPlugin(minecraftHawkEye);
+        configureMovements(bot);
 
         // bot.collectBlock.movements.digCost = 0;
         // bot.collectBlock.movements.placeCost = 0;
@@ -119,61 +201,271 @@ app.post("/start", (req, res) => {
             Chests,
             BlockRecords,
         ]);
+        bot.defaultObsProfile = req.body.observation || {};
+        bot.setObsProfile();
         skills.inject(bot);
 
+        timing.phase("wait");
         if (req.body.spread) {
             bot.chat(`/spreadplayers ~ ~ 0 300 under 80 false @s`);
             await bot.waitForTicks(bot.waitTicks);
         }
 
-        await bot.waitForTicks(bot.waitTicks * itemTicks);
-        res.json(bot.observe());
-
-        initCounter(bot);
-        bot.chat("/gamerule keepInventory true");
-        bot.chat("/gamerule doDaylightCycle false");
+        await settle(bot, bot.waitTicks * itemTicks, timing);
+        sendObservation(req, res, bot, timing);
+        releaseWorld(req.body.pause_after);
     });
 
     function onConnectionFailed(e) {
         console.log(e);
-        bot = null;
+        if (bots.get(botName) === bot) bots.delete(botName);
         res.status(400).json({ error: e });
     }
     function onDisconnect(message) {
         if (bot.viewer) {
             bot.viewer.close();
         }
+        forgetBot(bot);
         bot.end();
         console.log(message);
-        bot = null;
+        if (bots.get(botName) === bot) bots.delete(botName);
     }
 });
 
-app.post("/step", async (req, res) => {
+function canReuseBot(bot, options) {
+    return (
+        bot.entity &&
+        bot.obsList &&
+        bot._client.state === "play" &&
+        !bot.execution &&
+        bot.mcPort === options.port
+    );
+}
+
+async function softReset(bot, req, res) {
+    const timing = new Timing(bot);
+    timing.phase("prepare");
+    bot.waitTicks = req.body.waitTicks;
+    bot.globalTickCounter = 0;
+    bot.stuckTickCounter = 0;
+    bot.stuckPosList = [];
+    bot.resetObservations();
+    bot.defaultObsProfile = req.body.observation || {};
+    bot.setObsProfile();
+    const releaseWorld = holdWorld(bot);
+
+    if (req.body.position) {
+        bot.chat(
+            `/tp @s ${req.body.position.x} ${req.body.position.y} ${req.body.position.z}`
+        );
+    }
+    bot.iron_pickaxe = Boolean(
+        bot.inventory.items().find((item) => item.name === "iron_pickaxe")
+    );
+    setupWorld(bot, req.body);
+
+    timing.phase("wait");
+    if (req.body.spread) {
+        bot.chat(`/spreadplayers ~ ~ 0 300 under 80 false @s`);
+        await bot.waitForTicks(bot.waitTicks);
+    }
+    await settle(bot, bot.waitTicks, timing);
+    sendObservation(req, res, bot, timing);
+    releaseWorld(req.body.pause_after);
+}
+
+// gamerules every new bot sets, they stay in place over soft resets
+const DEFAULT_GAMERULES = { keepInventory: true, doDaylightCycle: false };
+
+// World setup a reset does before its observation: time ("next" moves on in
+// the bot's time cycle), difficulty and gamerules
+function setupWorld(bot, options, defaultGamerules = {}) {
+    initCounter(bot);
+    const gamerules = { ...defaultGamerules, ...(options.gamerules || {}) };
+    // the gamerules in place, for commands that change one for a moment
+    bot.gamerules = { ...(bot.gamerules || {}), ...gamerules };
+    for (const [rule, value] of Object.entries(gamerules)) {
+        bot.chat(`/gamerule ${rule} ${value}`);
+    }
+    if (options.time !== undefined && options.time !== null) {
+        const time = options.time === "next" ? getNextTime(bot) : options.time;
+        bot.chat(`/time set ${time}`);
+    }
+    if (options.difficulty) {
+        bot.chat(`/difficulty ${options.difficulty}`);
+    }
+}
+
+// The server's /pause command toggles the whole Minecraft server, so its
+// state is kept per server, keyed by port, and shared by the bots on it.
+// Requests that need the world running hold it through holdWorld, and the
+// server is only paused again once no bot holds it anymore.
+const servers = new Map();
+
+function getServer(port, paused = false) {
+    if (!servers.has(port)) {
+        // bot -> number of its requests holding the world
+        servers.set(port, { paused, holds: new Map(), pauseWhenIdle: false });
+    }
+    return servers.get(port);
+}
+
+// Only sends /pause when the state has to change, the settle that follows
+// waits for the server to answer
+function setPaused(bot, paused) {
+    const server = getServer(bot.mcPort);
+    if (paused && server.holds.size > 0) {
+        // the last request that still needs the world running pauses it
+        server.pauseWhenIdle = true;
+        return false;
+    }
+    server.pauseWhenIdle = false;
+    if (server.paused === paused) return false;
+    bot.chat("/pause");
+    server.paused = paused;
+    return true;
+}
+
+// Keep the world running for a request of the bot, the returned function
+// lets go of it and pauses the server if asked to and no other bot needs it
+function holdWorld(bot) {
+    const server = getServer(bot.mcPort);
+    server.holds.set(bot, (server.holds.get(bot) || 0) + 1);
+    setPaused(bot, false);
+    let held = true;
+    return (pauseAfter = false) => {
+        if (!held) return;
+        held = false;
+        const holds = server.holds.get(bot) - 1;
+        if (holds > 0) server.holds.set(bot, holds);
+        else server.holds.delete(bot);
+        if (pauseAfter || server.pauseWhenIdle) setPaused(bot, true);
+    };
+}
+
+// a bot that leaves holds nothing anymore, whatever its requests were doing
+function forgetBot(bot) {
+    const server = servers.get(bot.mcPort);
+    if (server) server.holds.delete(bot);
+}
+
+// Wait for the commands sent so far to be answered and the inventory to
+// settle, waitTicks style waits only give the upper bound
+async function settle(bot, maxTicks, timing = null) {
+    const waited = await getQuiescence(bot).wait(maxTicks);
+    if (timing) timing.recordWait(maxTicks, waited);
+}
+
+// Send the bot's events, next to the timing of the request when the client
+// asks for metadata
+function sendObservation(req, res, bot, timing) {
+    timing.phase("observe");
+    const events = bot.observeEvents();
+    // delta and msgpack or json encoding
+    timing.phase("serialize");
+    const encoded = encodeData(req, bot.encodeEvents(events));
+    if (req.body.metadata) {
+        sendEncoded(res, wrapEncoded(encoded, timing.finish()));
+    } else {
+        timing.finish();
+        sendEncoded(res, encoded);
+    }
+}
+
+app.post("/programs", (req, res) => {
+    let added;
+    try {
+        added = programRegistry.add(req.body.programs || {});
+    } catch (err) {
+        res.status(400).json({ error: err.message });
+        return;
+    }
+    res.json({ added: added.length, total: programRegistry.size });
+});
+
+router.post("/step", async (req, res) => {
+    const bot = getBot(req, res);
+    if (!bot) return;
+
+    // programs can be referenced by hash once uploaded through /programs
+    let programEntries;
+    let programsKey;
+    if (req.body.program_hashes) {
+        const missing = programRegistry.missing(req.body.program_hashes);
+        if (missing.length > 0) {
+            res.status(409).json({ error: "Unknown programs", missing });
+            return;
+        }
+        programEntries = programRegistry.entries(req.body.program_hashes);
+        programsKey = req.body.program_hashes.join(",");
+    } else {
+        const programs = req.body.programs || "";
+        programsKey = ProgramRegistry.hash(programs);
+        programEntries = [{ hash: programsKey, code: programs }];
+    }
+
+    const setupStart = Date.now();
+    const timing = new Timing(bot);
+    timing.phase("setup");
+
     // import useful package
     let response_sent = false;
+    let releaseWorld = () => {};
+    // an uncaught error of the program stops it, and the step reports it
+    let uncaughtError = null;
     function otherError(err) {
         console.log("Uncaught Error");
-        bot.emit("error", handleError(err));
-        bot.waitForTicks(bot.waitTicks).then(() => {
-            if (!response_sent) {
-                response_sent = true;
-                res.json(bot.observe());
-            }
-        });
+        if (uncaughtError || !execution.abort(err.message || String(err))) {
+            console.log(err.stack || err);
+            return;
+        }
+        uncaughtError = err;
+    }
+
+    // with stream set, every event is pushed to the client as it is recorded
+    const stream = Boolean(req.body.stream);
+    function streamEvent(event) {
+        writeStreamEvent(res, event[0], event);
+    }
+    if (stream) {
+        startEventStream(res);
+        bot.on("obsEvent", streamEvent);
     }
 
-    process.on("uncaughtException", otherError);
+    // the program is stopped when its budget runs out, on /cancel, or when a
+    // streaming client goes away
+    const execution = new Execution(bot, {
+        maxTicks: req.body.max_ticks,
+        maxMs: req.body.max_ms,
+        onError: otherError,
+    });
+    res.on("close", () => {
+        if (!response_sent) execution.abort("Client disconnected");
+    });
+
+    function sendStepObservation() {
+        if (response_sent) return;
+        response_sent = true;
+        if (stream) {
+            bot.observe();
+            timing.finish();
+            bot.removeListener("obsEvent", streamEvent);
+            endEventStream(res);
+        } else {
+            sendObservation(req, res, bot, timing);
+        }
+        // the next request that needs the world running unpauses it again
+        releaseWorld(req.body.pause_after);
+    }
 
-    const mcData = require("minecraft-data")(bot.version);
-    mcData.itemsByName["leather_cap"] = mcData.itemsByName["leather_helmet"];
-    mcData.itemsByName["leather_tunic"] =
-        mcData.itemsByName["leather_chestplate"];
-    mcData.itemsByName["leather_pants"] =
-        mcData.itemsByName["leather_leggings"];
-    mcData.itemsByName["leather_boots"] = mcData.itemsByName["leather_boots"];
-    mcData.itemsByName["lapis_lazuli_ore"] = mcData.itemsByName["lapis_ore"];
-    mcData.blocksByName["lapis_lazuli_ore"] = mcData.blocksByName["lapis_ore"];
+    // minecraft-data and movements are built on spawn, a step only rebuilds
+    // the movements when it asks for different ones
+    const mcData = bot.mcData;
+    if (req.body.movements) {
+        configureMovements(bot, req.body.movements);
+    } else if (bot.pathfinder.movements !== bot.movements) {
+        bot.pathfinder.setMovements(bot.movements);
+    }
     const {
         Movements,
         goals: {
@@ -203,13 +495,11 @@ app.post("/step", async (req, res) => {
     } = require("mineflayer-pathfinder");
     const { Vec3 } = require("vec3");
 
-    // Set up pathfinder
-    const movements = new Movements(bot, mcData);
-    bot.pathfinder.setMovements(movements);
-
     bot.globalTickCounter = 0;
     bot.stuckTickCounter = 0;
     bot.stuckPosList = [];
+    // /rollback takes back what this step places
+    bot.placements.startJournal();
 
     function onTick() {
         bot.globalTickCounter++;
@@ -224,39 +514,84 @@ app.post("/step", async (req, res) => {
 
     bot.on("physicsTick", onTick);
 
-    // initialize fail count
-    let _craftItemFailCount = 0;
-    let _killMobFailCount = 0;
-    let _mineBlockFailCount = 0;
-    let _placeItemFailCount = 0;
-    let _smeltItemFailCount = 0;
+    // globals of the skill context, refreshed on every step
+    const stepGlobals = {
+        bot: execution.botProxy,
+        mcData,
+        Vec3,
+        Movements,
+        Goal,
+        GoalBlock,
+        GoalNear,
+        GoalXZ,
+        GoalNearXZ,
+        GoalY,
+        GoalGetToBlock,
+        GoalLookAtBlock,
+        GoalBreakBlock,
+        GoalCompositeAny,
+        GoalCompositeAll,
+        GoalInvert,
+        GoalFollow,
+        GoalPlaceBlock,
+        pathfinder,
+        Move,
+        ComputedPath,
+        PartiallyComputedPath,
+        XZCoordinates,
+        XYZCoordinates,
+        SafeBlock,
+        GoalPlaceBlockOptions,
+        getNextTime: () => getNextTime(bot),
+        // initialize fail count
+        _craftItemFailCount: 0,
+        _killMobFailCount: 0,
+        _mineBlockFailCount: 0,
+        _placeItemFailCount: 0,
+        _smeltItemFailCount: 0,
+    };
+    const skillContext = getSkillContext(
+        bot,
+        programsKey,
+        programEntries,
+        stepGlobals
+    );
+    // fixed per-step cost before the program runs, streamed responses have
+    // already sent their headers
+    if (!res.headersSent) {
+        res.set("X-Step-Setup-Ms", String(Date.now() - setupStart));
+    }
 
     // Retrieve array form post bod
     const code = req.body.code;
-    const programs = req.body.programs;
     bot.cumulativeObs = [];
-    await bot.waitForTicks(bot.waitTicks);
-    const r = await evaluateCode(code, programs);
-    process.off("uncaughtException", otherError);
+    bot.setObsProfile(req.body.observation);
+    timing.phase("wait_before");
+    releaseWorld = holdWorld(bot);
+    await settle(bot, bot.waitTicks, timing);
+    timing.phase("execute");
+    const r = await evaluateCode(code);
+    execution.finish();
     if (r !== "success") {
         bot.emit("error", handleError(r));
     }
+    timing.phase("return_items");
     await returnItems();
     // wait for last message
-    await bot.waitForTicks(bot.waitTicks);
-    if (!response_sent) {
-        response_sent = true;
-        res.json(bot.observe());
-    }
+    timing.phase("wait_after");
+    await settle(bot, bot.waitTicks, timing);
+    sendStepObservation();
     bot.removeListener("physicsTick", onTick);
 
-    async function evaluateCode(code, programs) {
+    async function evaluateCode(code) {
         // Echo the code produced for players to see it. Don't echo when the bot code is already producing dialog or it will double echo
         try {
-            await eval("(async () => {" + programs + "\n" + code + "})()");
+            await stepErrorHandlers.run(otherError, () =>
+                execution.run(skillContext.run(code, stepGlobals, timing))
+            );
             return "success";
         } catch (err) {
-            return err;
+            return uncaughtError || err;
         }
     }
 
@@ -299,26 +634,17 @@ app.post("/step", async (req, res) => {
 
     function returnItems() {
         bot.chat("/gamerule doTileDrops false");
-        const crafting_table = bot.findBlock({
-            matching: mcData.blocksByName.crafting_table.id,
-            maxDistance: 128,
-        });
-        if (crafting_table) {
-            bot.chat(
-                `/setblock ${crafting_table.position.x} ${crafting_table.position.y} ${crafting_table.position.z} air destroy`
-            );
-            bot.chat("/give @s crafting_table");
-        }
-        const furnace = bot.findBlock({
-            matching: mcData.blocksByName.furnace.id,
-            maxDistance: 128,
+        // only blocks the bot placed are taken back, see lib/placements.js
+        ["crafting_table", "furnace"].forEach((name) => {
+            const position = bot.placements.latest(name);
+            if (position) {
+                bot.chat(
+                    `/setblock ${position.x} ${position.y} ${position.z} air destroy`
+                );
+                bot.chat(`/give @s ${name}`);
+                bot.placements.remove(name, position);
+            }
         });
-        if (furnace) {
-            bot.chat(
-                `/setblock ${furnace.position.x} ${furnace.position.y} ${furnace.position.z} air destroy`
-            );
-            bot.chat("/give @s furnace");
-        }
         if (bot.inventoryUsed() >= 32) {
             // if chest is not in bot's inventory
             if (!bot.inventory.items().find((item) => item.name === "chest")) {
@@ -342,18 +668,16 @@ app.post("/step", async (req, res) => {
         }
         console.log(stack);
         const final_line = stack.split("\n")[1];
-        const regex = /<anonymous>:(\d+):\d+\)/;
+        const regex =
+            /(?<file>program_[0-9a-f]+\.js|code\.js):(?<line>\d+):(?<pos>\d+)/;
 
-        const programs_length = programs.split("\n").length;
+        // first frame inside the submitted code
         let match_line = null;
         for (const line of stack.split("\n")) {
             const match = regex.exec(line);
-            if (match) {
-                const line_num = parseInt(match[1]);
-                if (line_num >= programs_length) {
-                    match_line = line_num - programs_length;
-                    break;
-                }
+            if (match && match.groups.file === CODE_FILENAME) {
+                match_line = parseInt(match.groups.line);
+                break;
             }
         }
         if (!match_line) {
@@ -362,6 +686,9 @@ app.post("/step", async (req, res) => {
         let f_line = final_line.match(
             /\((?<file>.*):(?<line>\d+):(?<pos>\d+)\)/
         );
+        if (!f_line) {
+            f_line = final_line.match(regex);
+        }
         if (f_line && f_line.groups && fs.existsSync(f_line.groups.file)) {
             const { file, line, pos } = f_line.groups;
             const f = fs.readFileSync(file, "utf8").split("\n");
@@ -376,18 +703,17 @@ app.post("/step", async (req, res) => {
         } else if (
             f_line &&
             f_line.groups &&
-            f_line.groups.file.includes("<anonymous>")
+            skillContext.sources.has(f_line.groups.file)
         ) {
             const { file, line, pos } = f_line.groups;
             let source =
                 "Your code" +
                 `:${match_line}\n${code.split("\n")[match_line - 1].trim()}\n `;
             let code_source = "";
-            if (line < programs_length) {
+            if (file !== CODE_FILENAME) {
+                const program = skillContext.sources.get(file).split("\n");
                 source =
-                    "In your program code: " +
-                    programs.split("\n")[line - 1].trim() +
-                    "\n";
+                    "In your program code: " + program[line - 1].trim() + "\n";
                 code_source = `at line ${match_line}:${code
                     .split("\n")
                     [match_line - 1].trim()} in your code`;
@@ -398,28 +724,101 @@ app.post("/step", async (req, res) => {
     }
 });
 
-app.post("/stop", (req, res) => {
+router.post("/nearest", (req, res) => {
+    const bot = getBot(req, res);
+    if (!bot) return;
+    const positions = getWorldMap(bot).nearest(req.body.name, bot.entity.position, {
+        count: req.body.count || 1,
+        maxDistance: req.body.max_distance || Infinity,
+    });
+    res.json({ positions: positions.map(({ x, y, z }) => ({ x, y, z })) });
+});
+
+// Take back the blocks the last step placed, when it failed. Answers with the
+// inventory and voxels after the rollback as the only event, the observation
+// profile of the request can ask for more.
+router.post("/rollback", async (req, res) => {
+    const bot = getBot(req, res);
+    if (!bot) return;
+    const timing = new Timing(bot);
+    timing.phase("prepare");
+    let releaseWorld = () => {};
+    if (bot.placements.journal.length > 0) {
+        releaseWorld = holdWorld(bot);
+        const rolledBack = bot.placements.rollback();
+        timing.phase("wait");
+        await settle(bot, bot.waitTicks * rolledBack, timing);
+    }
+    bot.setObsProfile({
+        observers: ["inventory", "voxels"],
+        events: [],
+        ...req.body.observation,
+    });
+    sendObservation(req, res, bot, timing);
+    releaseWorld();
+    if (req.body.pause_after) setPaused(bot, true);
+});
+
+router.post("/cancel", (req, res) => {
+    const bot = getBot(req, res);
+    if (!bot) return;
+    // the pending /step answers with the observation as usual
+    const cancelled = Boolean(
+        bot.execution && bot.execution.abort("Execution cancelled")
+    );
+    res.json({ cancelled });
+});
+
+router.post("/stop", (req, res) => {
+    const bot = getBot(req, res);
+    if (!bot) return;
+    forgetBot(bot);
+    setPaused(bot, false);
     bot.end();
+    bots.delete(getBotName(req));
     res.json({
         message: "Bot stopped",
     });
 });
 
-app.post("/pause", (req, res) => {
-    if (!bot) {
-        res.status(400).json({ error: "Bot not spawned" });
-        return;
+router.post("/pause", (req, res) => {
+    const bot = getBot(req, res);
+    if (!bot) return;
+    // without an explicit state the request toggles, as it always did
+    const server = getServer(bot.mcPort);
+    const paused =
+        typeof req.body.paused === "boolean" ? req.body.paused : !server.paused;
+    const respond = () =>
+        res.json({ message: "Success", paused: server.paused });
+    if (setPaused(bot, paused)) {
+        settle(bot, bot.waitTicks).then(respond);
+    } else {
+        respond();
     }
-    bot.chat("/pause");
-    bot.waitForTicks(bot.waitTicks).then(() => {
-        res.json({ message: "Success" });
-    });
 });
 
-// Server listening to PORT 3000
+app.use("/bots/:botName", router);
+app.use("/", router);
+
+// Server listening to PORT 3000, or to a unix domain socket if given a path
 
 const DEFAULT_PORT = 3000;
 const PORT = process.argv[2] || DEFAULT_PORT;
-app.listen(PORT, () => {
-    console.log(`Server started on port ${PORT}`);
-});
+if (/^\d+$/.test(String(PORT))) {
+    app.listen(PORT, () => {
+        console.log(`Server started on port ${PORT}`);
+    });
+} else {
+    // a socket file left behind by a crashed bridge would make listen fail,
+    // anything else at that path is not ours to delete
+    if (fs.existsSync(PORT)) {
+        if (!fs.lstatSync(PORT).isSocket()) {
+            console.error(`${PORT} exists and is not a socket`);
+            process.exit(1);
+        }
+        fs.unlinkSync(PORT);
+    }
+    app.listen(PORT, () => {
+        console.log(`Server started on socket ${PORT}`);
+    });
+}
@@ -0,0 +1,111 @@
+// MessagePack is optional, responses fall back to plain JSON without it
+let msgpack = null;
+try {
+    msgpack = require("@msgpack/msgpack");
+} catch (err) {
+    msgpack = null;
+}
+
+const MSGPACK_TYPE = "application/msgpack";
+
+function encodeMsgpack(data) {
+    return Buffer.from(msgpack.encode(data, { ignoreUndefined: true }));
+}
+
+// Encode a structured response, as MessagePack if the client asks for it
+function encodeData(req, data) {
+    const accept = req.get("Accept") || "";
+    if (msgpack && accept.includes(MSGPACK_TYPE)) {
+        return { type: MSGPACK_TYPE, body: encodeMsgpack(data) };
+    }
+    return { type: "application/json", body: JSON.stringify(data) };
+}
+
+// {events, metadata} around events that are encoded already, so the metadata
+// can include the time spent encoding them
+function wrapEncoded(encoded, metadata) {
+    if (encoded.type === MSGPACK_TYPE) {
+        return {
+            type: MSGPACK_TYPE,
+            body: Buffer.concat([
+                // fixmap of two entries
+                Buffer.from([0x82]),
+                encodeMsgpack("events"),
+                encoded.body,
+                encodeMsgpack("metadata"),
+                encodeMsgpack(metadata),
+            ]),
+        };
+    }
+    return {
+        type: encoded.type,
+        body: `{"events":${encoded.body},"metadata":${JSON.stringify(metadata)}}`,
+    };
+}
+
+function sendEncoded(res, encoded) {
+    res.type(encoded.type);
+    res.send(encoded.body);
+}
+
+// Server-sent events, used to push observation events while a step runs
+function startEventStream(res) {
+    res.writeHead(200, {
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache",
+        Connection: "keep-alive",
+    });
+}
+
+function writeStreamEvent(res, name, data) {
+    res.write(`event: ${name}\ndata: ${JSON.stringify(data)}\n\n`);
+}
+
+function endEventStream(res) {
+    writeStreamEvent(res, "end", null);
+    res.end();
+}
+
+function isPlainObject(value) {
+    return value !== null && typeof value === "object" && !Array.isArray(value);
+}
+
+// Operations that turn `to` into `from`: [path, value] sets a value and
+// [path] deletes a key. Arrays and scalars are replaced as a whole.
+function diffObjects(from, to, path = [], ops = []) {
+    for (const key in to) {
+        if (!(key in from)) ops.push([[...path, key]]);
+    }
+    for (const key in from) {
+        const value = from[key];
+        if (isPlainObject(value) && isPlainObject(to[key])) {
+            diffObjects(value, to[key], [...path, key], ops);
+        } else if (
+            !(key in to) ||
+            JSON.stringify(value) !== JSON.stringify(to[key])
+        ) {
+            ops.push([[...path, key], value]);
+        }
+    }
+    return ops;
+}
+
+// Only the last event stays a full snapshot, every other event becomes
+// {$delta: ops} against the event that follows it
+function encodeDelta(events) {
+    return events.map(([name, result], i) => {
+        if (i === events.length - 1) return [name, result];
+        return [name, { $delta: diffObjects(result, events[i + 1][1]) }];
+    });
+}
+
+module.exports = {
+    MSGPACK_TYPE,
+    encodeDelta,
+    encodeData,
+    wrapEncoded,
+    sendEncoded,
+    startEventStream,
+    writeStreamEvent,
+    endEventStream,
+};
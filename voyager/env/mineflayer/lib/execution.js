@@ -0,0 +1,87 @@
+// Cooperative cancellation of the program a bot runs during /step.
+//
+// The program only ever sees a proxy of the bot whose waitForTicks throws once
+// the execution is aborted, so loops in generated code stop at their next wait
+// while plugins keep using the real bot.
+class Execution {
+    constructor(bot, { maxTicks = null, maxMs = null, onError = null } = {}) {
+        this.bot = bot;
+        // handles uncaught errors of the program's callbacks
+        this.onError = onError;
+        this.reason = null;
+        this.finished = false;
+        this.ticks = 0;
+        this.aborted = new Promise((resolve, reject) => {
+            this.rejectAborted = reject;
+        });
+        // only observed through run()
+        this.aborted.catch(() => {});
+
+        this.onTick = () => {
+            this.ticks++;
+            if (maxTicks && this.ticks >= maxTicks) {
+                this.abort(`Execution exceeded the budget of ${maxTicks} ticks`);
+            }
+        };
+        bot.on("physicsTick", this.onTick);
+        this.timer = maxMs
+            ? setTimeout(() => {
+                  this.abort(`Execution exceeded the budget of ${maxMs} ms`);
+              }, maxMs)
+            : null;
+
+        this.waitForTicks = async (ticks) => {
+            this.throwIfAborted();
+            await bot.waitForTicks(ticks);
+            this.throwIfAborted();
+        };
+        this.botProxy = new Proxy(bot, {
+            get: (target, prop) => {
+                if (prop === "waitForTicks") return this.waitForTicks;
+                return Reflect.get(target, prop);
+            },
+        });
+        bot.execution = this;
+    }
+
+    throwIfAborted() {
+        if (this.reason) {
+            throw new Error(this.reason);
+        }
+    }
+
+    run(promise) {
+        return Promise.race([promise, this.aborted]);
+    }
+
+    abort(reason) {
+        if (this.reason || this.finished) return false;
+        this.reason = reason;
+        haltBot(this.bot);
+        this.rejectAborted(new Error(reason));
+        return true;
+    }
+
+    finish() {
+        this.finished = true;
+        this.bot.removeListener("physicsTick", this.onTick);
+        clearTimeout(this.timer);
+        if (this.bot.execution === this) {
+            this.bot.execution = null;
+        }
+    }
+}
+
+// Stop everything a program may have left running
+function haltBot(bot) {
+    if (bot.pathfinder) bot.pathfinder.setGoal(null);
+    if (bot.targetDigBlock) bot.stopDigging();
+    if (bot.pvp) bot.pvp.stop();
+    if (bot.hawkEye) bot.hawkEye.stop();
+    if (bot.collectBlock) {
+        Promise.resolve(bot.collectBlock.cancelTask()).catch(() => {});
+    }
+    bot.clearControlStates();
+}
+
+module.exports = { Execution, haltBot };
@@ -1,3 +1,5 @@
+const { encodeDelta } = require("../encoding");
+
 class Observation {
     constructor(bot) {
         if (new.target === Observation) {
@@ -10,35 +12,86 @@ class Observation {
         this.name = "Observation";
     }
 
-    observe() {
+    // profile is the observation profile of the current request
+    observe(profile) {
         throw new TypeError("Method 'observe()' must be implemented.");
     }
 
     reset() {}
 }
 
+// An observation profile selects what each event carries:
+// - observers: names of the observations to compute, all when unset
+// - events: event names to record besides the final observe, all when unset
+// - voxel_radius: horizontal radius of the voxels observation
+// - changed_only: intermediate events leave out observations that did not
+//   change since the last event
+// - delta: the observe response only keeps the last event whole and encodes
+//   the others as diffs, see encodeDelta
 function inject(bot, obs_list) {
     bot.obsList = [];
     bot.cumulativeObs = [];
     bot.eventMemory = {};
+    bot.defaultObsProfile = {};
+    bot.obsProfile = {};
+    bot.lastObserved = {};
     obs_list.forEach((obs) => {
         bot.obsList.push(new obs(bot));
     });
+    bot.setObsProfile = function (profile) {
+        bot.obsProfile = { ...bot.defaultObsProfile, ...profile };
+        bot.lastObserved = {};
+    };
     bot.event = function (event_name) {
+        const profile = bot.obsProfile;
+        const recorded =
+            event_name === "observe" ||
+            !profile.events ||
+            profile.events.includes(event_name);
         let result = {};
         bot.obsList.forEach((obs) => {
-            if (obs.name.startsWith("on") && obs.name !== event_name) {
+            if (obs.name.startsWith("on")) {
+                // pending on* events are consumed even when not recorded
+                if (obs.name === event_name) result[obs.name] = obs.observe();
+                return;
+            }
+            if (
+                !recorded ||
+                (profile.observers && !profile.observers.includes(obs.name))
+            ) {
                 return;
             }
-            result[obs.name] = obs.observe();
+            const value = obs.observe(profile);
+            if (profile.changed_only) {
+                const serialized = JSON.stringify(value);
+                const unchanged = bot.lastObserved[obs.name] === serialized;
+                bot.lastObserved[obs.name] = serialized;
+                if (unchanged && event_name !== "observe") return;
+            }
+            result[obs.name] = value;
         });
+        if (!recorded) return;
         bot.cumulativeObs.push([event_name, result]);
+        bot.emit("obsEvent", [event_name, result]);
     };
-    bot.observe = function () {
+    // forget everything observed so far, used when a bot is reused on reset
+    bot.resetObservations = function () {
+        bot.obsList.forEach((obs) => obs.reset());
+        bot.cumulativeObs = [];
+        bot.lastObserved = {};
+    };
+    // events recorded since the last observe, ending with this observe
+    bot.observeEvents = function () {
         bot.event("observe");
-        const result = bot.cumulativeObs;
+        const events = bot.cumulativeObs;
         bot.cumulativeObs = [];
-        return JSON.stringify(result);
+        return events;
+    };
+    bot.encodeEvents = function (events) {
+        return bot.obsProfile.delta ? encodeDelta(events) : events;
+    };
+    bot.observe = function () {
+        return bot.encodeEvents(bot.observeEvents());
     };
 }
 
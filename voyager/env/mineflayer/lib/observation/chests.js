@@ -26,6 +26,10 @@ class Chests extends Observation {
         });
         return this.chestsItems;
     }
+
+    reset() {
+        this.chestsItems = {};
+    }
 }
 
 module.exports = Chests;
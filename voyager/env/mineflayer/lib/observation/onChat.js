@@ -21,6 +21,10 @@ class onChat extends Observation {
         this.obs = "";
         return result;
     }
+
+    reset() {
+        this.obs = "";
+    }
 }
 
 module.exports = onChat;
@@ -17,6 +17,10 @@ class onError extends Observation {
         this.obs = null;
         return result;
     }
+
+    reset() {
+        this.obs = null;
+    }
 }
 
 module.exports = onError;
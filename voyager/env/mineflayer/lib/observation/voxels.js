@@ -1,14 +1,16 @@
 // Blocks = require("./blocks")
 const { Observation } = require("./base");
+const { getVoxelCache } = require("../voxelCache");
 
 class Voxels extends Observation {
     constructor(bot) {
         super(bot);
         this.name = "voxels";
+        this.cache = getVoxelCache(bot);
     }
 
-    observe() {
-        return Array.from(getSurroundingBlocks(this.bot, 8, 2, 8));
+    observe(profile = {}) {
+        return Array.from(this.cache.names(profile.voxel_radius));
     }
 }
 
@@ -18,11 +20,12 @@ class BlockRecords extends Observation {
         this.name = "blockRecords";
         this.records = new Set();
         this.tick = 0;
+        this.cache = getVoxelCache(bot);
         bot.on("physicsTick", () => {
             this.tick++;
             if (this.tick >= 100) {
                 const items = getInventoryItems(this.bot);
-                getSurroundingBlocks(this.bot, 8, 2, 8).forEach((block) => {
+                this.cache.names().forEach((block) => {
                     if (!items.has(block)) this.records.add(block);
                 });
                 this.tick = 0;
@@ -36,26 +39,10 @@ class BlockRecords extends Observation {
 
     reset() {
         this.records = new Set();
+        this.tick = 0;
     }
 }
 
-function getSurroundingBlocks(bot, x_distance, y_distance, z_distance) {
-    const surroundingBlocks = new Set();
-
-    for (let x = -x_distance; x <= x_distance; x++) {
-        for (let y = -y_distance; y <= y_distance; y++) {
-            for (let z = -z_distance; z <= z_distance; z++) {
-                const block = bot.blockAt(bot.entity.position.offset(x, y, z));
-                if (block && block.type !== 0) {
-                    surroundingBlocks.add(block.name);
-                }
-            }
-        }
-    }
-    // console.log(surroundingBlocks);
-    return surroundingBlocks;
-}
-
 function getInventoryItems(bot) {
     const items = new Set();
     bot.inventory.items().forEach((item) => {
@@ -0,0 +1,26 @@
+const { Movements } = require("mineflayer-pathfinder");
+
+// minecraft-data of a version, with the aliases generated code tends to use
+function loadMcData(version) {
+    const mcData = require("minecraft-data")(version);
+    mcData.itemsByName["leather_cap"] = mcData.itemsByName["leather_helmet"];
+    mcData.itemsByName["leather_tunic"] =
+        mcData.itemsByName["leather_chestplate"];
+    mcData.itemsByName["leather_pants"] =
+        mcData.itemsByName["leather_leggings"];
+    mcData.itemsByName["leather_boots"] = mcData.itemsByName["leather_boots"];
+    mcData.itemsByName["lapis_lazuli_ore"] = mcData.itemsByName["lapis_ore"];
+    mcData.blocksByName["lapis_lazuli_ore"] = mcData.blocksByName["lapis_ore"];
+    return mcData;
+}
+
+// Built once on spawn and reused by every step. Passing options rebuilds the
+// movements with those properties set, e.g. { canDig: false }.
+function configureMovements(bot, options = {}) {
+    if (!bot.mcData) bot.mcData = loadMcData(bot.version);
+    bot.movements = Object.assign(new Movements(bot, bot.mcData), options);
+    bot.pathfinder.setMovements(bot.movements);
+    return bot.movements;
+}
+
+module.exports = { loadMcData, configureMovements };
@@ -0,0 +1,121 @@
+// Positions of the blocks the bot placed itself, fed by bot.placeBlock and
+// pruned when the block at a recorded position changes. Taking back crafting
+// tables and furnaces after a step, and givePlacedItemBack, look blocks up
+// here instead of searching the world for them.
+class PlacementIndex {
+    constructor(bot) {
+        this.bot = bot;
+        // block name -> Map of position key -> position, oldest first
+        this.placed = new Map();
+        // blocks bot.placeBlock recorded since startJournal that no
+        // <name>_placed event has claimed yet
+        this.unclaimed = [];
+        // placements of the current step in order: the <name>_placed onSave
+        // events of placeItem, matched against the blocks placeBlock recorded
+        // in the same step, see startJournal and rollback
+        this.journal = [];
+        bot.on("blockUpdate", (oldBlock, newBlock) => {
+            if (oldBlock && newBlock && oldBlock.name !== newBlock.name) {
+                this.remove(oldBlock.name, newBlock.position);
+            }
+        });
+        bot.on("save", (eventName) => {
+            if (!eventName.endsWith("_placed")) return;
+            const name = eventName.slice(0, -"_placed".length);
+            // the newest unclaimed block of that name; an event placeBlock
+            // recorded nothing for (a late block update, or an item placing
+            // a block of another name) is not journaled
+            for (let i = this.unclaimed.length - 1; i >= 0; i--) {
+                if (this.unclaimed[i].name === name) {
+                    this.journal.push(this.unclaimed.splice(i, 1)[0]);
+                    return;
+                }
+            }
+        });
+    }
+
+    record(block) {
+        if (!block || block.type === 0) return;
+        if (!this.placed.has(block.name)) {
+            this.placed.set(block.name, new Map());
+        }
+        const positions = this.placed.get(block.name);
+        const key = block.position.toString();
+        positions.delete(key);
+        positions.set(key, block.position.clone());
+        this.unclaimed.push({
+            name: block.name,
+            position: block.position.clone(),
+        });
+    }
+
+    remove(name, position) {
+        const positions = this.placed.get(name);
+        if (positions) positions.delete(position.toString());
+    }
+
+    positions(name) {
+        const positions = this.placed.get(name);
+        return positions ? Array.from(positions.values()) : [];
+    }
+
+    latest(name) {
+        const positions = this.positions(name);
+        return positions.length > 0 ? positions[positions.length - 1] : null;
+    }
+
+    nearest(name, position, maxDistance = Infinity) {
+        let nearest = null;
+        let nearestDistance = maxDistance;
+        this.positions(name).forEach((placed) => {
+            const distance = placed.distanceTo(position);
+            if (distance <= nearestDistance) {
+                nearest = placed;
+                nearestDistance = distance;
+            }
+        });
+        return nearest;
+    }
+
+    startJournal() {
+        this.unclaimed = [];
+        this.journal = [];
+    }
+
+    // Take the journaled blocks back out of the world, newest first, and give
+    // them back to the bot. Only blocks placed in this step are journaled,
+    // blocks that are gone already were returned by returnItems or mined
+    // again. Returns the number of blocks taken back.
+    rollback() {
+        const journal = this.journal;
+        this.journal = [];
+        const seen = new Set();
+        const taken = journal.reverse().filter(({ name, position }) => {
+            if (seen.has(position.toString())) return false;
+            seen.add(position.toString());
+            return this.bot.blockAt(position)?.name === name;
+        });
+        if (taken.length === 0) return 0;
+        // doTileDrops goes back to what the reset set up, see setupWorld
+        const tileDrops = this.bot.gamerules?.doTileDrops ?? true;
+        this.bot.chat("/gamerule doTileDrops false");
+        taken.forEach(({ name, position }) => {
+            this.bot.chat(
+                `/setblock ${position.x} ${position.y} ${position.z} air destroy`
+            );
+            this.remove(name, position);
+            this.bot.chat(`/give @s ${name} 1`);
+        });
+        this.bot.chat(`/gamerule doTileDrops ${tileDrops}`);
+        return taken.length;
+    }
+}
+
+function getPlacementIndex(bot) {
+    if (!bot.placements) {
+        bot.placements = new PlacementIndex(bot);
+    }
+    return bot.placements;
+}
+
+module.exports = { PlacementIndex, getPlacementIndex };
@@ -0,0 +1,43 @@
+const crypto = require("crypto");
+
+// Content-addressed store of skill programs. Python uploads each program once
+// and then references it by hash in /step, so the step payload no longer grows
+// with the skill library.
+class ProgramRegistry {
+    constructor() {
+        this.programs = new Map();
+    }
+
+    static hash(code) {
+        return crypto.createHash("sha256").update(code, "utf8").digest("hex");
+    }
+
+    add(programs) {
+        const added = [];
+        for (const hash in programs) {
+            const code = programs[hash];
+            if (ProgramRegistry.hash(code) !== hash) {
+                throw new Error(`Hash mismatch for program ${hash}`);
+            }
+            if (!this.programs.has(hash)) {
+                this.programs.set(hash, code);
+                added.push(hash);
+            }
+        }
+        return added;
+    }
+
+    missing(hashes) {
+        return hashes.filter((hash) => !this.programs.has(hash));
+    }
+
+    entries(hashes) {
+        return hashes.map((hash) => ({ hash, code: this.programs.get(hash) }));
+    }
+
+    get size() {
+        return this.programs.size;
+    }
+}
+
+module.exports = { ProgramRegistry };
@@ -0,0 +1,73 @@
+// Decides when the bot's surroundings have settled after a step: every
+// command sent through bot.chat was answered by the server and the inventory
+// has not changed for a few ticks. Waits end at that point instead of always
+// taking waitTicks.
+class Quiescence {
+    constructor(bot, settleTicks = 2) {
+        this.bot = bot;
+        this.settleTicks = settleTicks;
+        this.pending = 0;
+        this.quietTicks = 0;
+        // over the bot's lifetime
+        this.stats = { waits: 0, bound_ticks: 0, waited_ticks: 0 };
+
+        const onActivity = () => {
+            this.quietTicks = 0;
+        };
+        bot.on("messagestr", (message, position, jsonMsg, sender) => {
+            if (!isCommandFeedback(position, jsonMsg, sender)) return;
+            this.pending = Math.max(0, this.pending - 1);
+            onActivity();
+        });
+        bot.inventory.on("updateSlot", onActivity);
+        bot.on("physicsTick", () => {
+            this.quietTicks++;
+        });
+    }
+
+    commandSent() {
+        this.pending++;
+        this.quietTicks = 0;
+    }
+
+    get settled() {
+        return this.pending === 0 && this.quietTicks >= this.settleTicks;
+    }
+
+    // Wait at least one tick and at most maxTicks, returns the ticks waited
+    async wait(maxTicks) {
+        let waited = 0;
+        while (waited < maxTicks) {
+            await this.bot.waitForTicks(1);
+            waited++;
+            if (this.settled) break;
+        }
+        // commands the server never answers must not hold up later waits
+        this.pending = 0;
+        this.stats.waits++;
+        this.stats.bound_ticks += maxTicks;
+        this.stats.waited_ticks += waited;
+        return waited;
+    }
+}
+
+const NO_SENDER = "00000000-0000-0000-0000-000000000000";
+
+// The server answers commands with system messages. Chat of players and other
+// bots, the bot's own echoed chat and action bar text answer nothing; when
+// feedback is missed, waits still end after their maximum ticks.
+function isCommandFeedback(position, jsonMsg, sender) {
+    if (position !== "system") return false;
+    if (sender && sender !== NO_SENDER) return false;
+    const translate = jsonMsg && jsonMsg.translate;
+    return !(typeof translate === "string" && translate.startsWith("chat.type."));
+}
+
+function getQuiescence(bot) {
+    if (!bot.quiescence) {
+        bot.quiescence = new Quiescence(bot);
+    }
+    return bot.quiescence;
+}
+
+module.exports = { Quiescence, getQuiescence };
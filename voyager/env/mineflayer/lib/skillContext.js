@@ -0,0 +1,95 @@
+const vm = require("vm");
+const { PRIMITIVES } = require("./timing");
+
+// Compiled programs are shared by every context, so a skill is only compiled
+// once no matter how often the skill set changes.
+const scriptCache = new Map();
+
+const CODE_FILENAME = "code.js";
+
+function programFilename(hash) {
+    return `program_${hash.slice(0, 16)}.js`;
+}
+
+function compileProgram(hash, code) {
+    let script = scriptCache.get(hash);
+    if (!script) {
+        script = new vm.Script(code, { filename: programFilename(hash) });
+        scriptCache.set(hash, script);
+    }
+    return script;
+}
+
+// A persistent vm context per bot where control primitives and learned skills
+// stay defined across steps. It is only rebuilt when the skill set changes.
+class SkillContext {
+    constructor(key, entries, globals) {
+        this.key = key;
+        this.sources = new Map();
+        this.timing = null;
+        this.context = vm.createContext({
+            console,
+            require,
+            process,
+            Buffer,
+            setTimeout,
+            clearTimeout,
+            setInterval,
+            clearInterval,
+            setImmediate,
+            clearImmediate,
+            ...globals,
+        });
+        entries.forEach(({ hash, code }) => {
+            this.sources.set(programFilename(hash), code);
+            compileProgram(hash, code).runInContext(this.context);
+        });
+        PRIMITIVES.forEach((name) => this.instrument(name));
+    }
+
+    // Report every call of an async function to the timing of the running step
+    instrument(name) {
+        const original = this.context[name];
+        if (
+            typeof original !== "function" ||
+            original.constructor.name !== "AsyncFunction"
+        ) {
+            return;
+        }
+        const skillContext = this;
+        this.context[name] = async function (...args) {
+            const timing = skillContext.timing;
+            if (!timing) return original.apply(this, args);
+            const mark = timing.mark();
+            let failed = false;
+            try {
+                return await original.apply(this, args);
+            } catch (err) {
+                failed = true;
+                throw err;
+            } finally {
+                timing.recordPrimitive(name, mark, failed);
+            }
+        };
+    }
+
+    // Only the per-step exec snippet is compiled fresh
+    run(code, globals, timing = null) {
+        this.timing = timing;
+        Object.assign(this.context, globals);
+        this.sources.set(CODE_FILENAME, code);
+        const script = new vm.Script("(async () => {" + code + "\n})()", {
+            filename: CODE_FILENAME,
+        });
+        return script.runInContext(this.context);
+    }
+}
+
+function getSkillContext(bot, key, entries, globals) {
+    if (!bot.skillContext || bot.skillContext.key !== key) {
+        bot.skillContext = new SkillContext(key, entries, globals);
+    }
+    return bot.skillContext;
+}
+
+module.exports = { CODE_FILENAME, SkillContext, getSkillContext };
@@ -1,4 +1,24 @@
+const { getPlacementIndex } = require("./placements");
+const { getQuiescence } = require("./quiescence");
+
 function inject(bot) {
+    const placements = getPlacementIndex(bot);
+    bot._placeBlock = bot.placeBlock;
+    bot.placeBlock = async (referenceBlock, faceVector) => {
+        const position = referenceBlock.position.plus(faceVector);
+        const before = bot.blockAt(position);
+        try {
+            await bot._placeBlock(referenceBlock, faceVector);
+        } finally {
+            // placeBlock can throw even though the block was placed, but a
+            // block that did not change was there before
+            const after = bot.blockAt(position);
+            if (after && (!before || after.type !== before.type)) {
+                placements.record(after);
+            }
+        }
+    };
+
     bot._sleep = bot.sleep;
     bot.sleep = async (bedBlock) => {
         await bot.waitForTicks(20);
@@ -58,12 +78,7 @@ function inject(bot) {
         await bot._activateBlock(block);
     };
 
-    bot._chat = bot.chat;
-    bot.chat = (message) => {
-        // action_count.chat++;
-        bot.emit("chatEvent", "bot", message);
-        bot._chat(message);
-    };
+    injectChat(bot);
 
     bot.inventoryUsed = () => {
         return bot.inventory.slots.slice(9, 45).filter((item) => item !== null)
@@ -75,5 +90,22 @@ function inject(bot) {
     };
 }
 
+// Commands sent through bot.chat are counted as pending until the server
+// answers them. The reset commands of /start are sent before the skills are
+// injected, so they wrap bot.chat first; wrapping again is a no-op.
+function injectChat(bot) {
+    if (bot._chat) return;
+    const quiescence = getQuiescence(bot);
+    bot._chat = bot.chat;
+    bot.chat = (message) => {
+        // action_count.chat++;
+        bot.emit("chatEvent", "bot", message);
+        if (typeof message === "string" && message.startsWith("/")) {
+            quiescence.commandSent();
+        }
+        bot._chat(message);
+    };
+}
+
 // export all control_primitives
-module.exports = { inject };
+module.exports = { inject, injectChat };
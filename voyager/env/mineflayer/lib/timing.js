@@ -0,0 +1,83 @@
+// Control primitives whose calls are counted and timed during /step
+const PRIMITIVES = [
+    "craftItem",
+    "exploreUntil",
+    "givePlacedItemBack",
+    "killMob",
+    "mineBlock",
+    "placeItem",
+    "shoot",
+    "smeltItem",
+    "getItemFromChest",
+    "depositItemIntoChest",
+    "checkItemInsideChest",
+];
+
+// Wall-clock milliseconds and game ticks spent in each phase of a request and
+// in the control primitives a program calls
+class Timing {
+    constructor(bot) {
+        this.bot = bot;
+        this.ticks = 0;
+        this.onTick = () => {
+            this.ticks++;
+        };
+        bot.on("physicsTick", this.onTick);
+        this.startMark = this.mark();
+        this.current = null;
+        this.phases = {};
+        this.primitives = {};
+        this.waits = { waits: 0, bound_ticks: 0, waited_ticks: 0 };
+    }
+
+    mark() {
+        return { ms: Date.now(), ticks: this.ticks };
+    }
+
+    since(mark) {
+        return { ms: Date.now() - mark.ms, ticks: this.ticks - mark.ticks };
+    }
+
+    // Ends the running phase and starts the next one
+    phase(name) {
+        if (this.current) {
+            this.phases[this.current.name] = this.since(this.current.mark);
+        }
+        this.current = name ? { name, mark: this.mark() } : null;
+    }
+
+    recordPrimitive(name, mark, failed) {
+        if (!this.primitives[name]) {
+            this.primitives[name] = { calls: 0, errors: 0, ms: 0, ticks: 0 };
+        }
+        const stats = this.primitives[name];
+        const { ms, ticks } = this.since(mark);
+        stats.calls++;
+        stats.ms += ms;
+        stats.ticks += ticks;
+        if (failed) stats.errors++;
+    }
+
+    // An adaptive wait that could have taken boundTicks took waitedTicks
+    recordWait(boundTicks, waitedTicks) {
+        this.waits.waits++;
+        this.waits.bound_ticks += boundTicks;
+        this.waits.waited_ticks += waitedTicks;
+    }
+
+    finish() {
+        this.phase(null);
+        this.bot.removeListener("physicsTick", this.onTick);
+        return {
+            total: this.since(this.startMark),
+            phases: this.phases,
+            primitives: this.primitives,
+            waits: {
+                ...this.waits,
+                saved_ticks: this.waits.bound_ticks - this.waits.waited_ticks,
+            },
+        };
+    }
+}
+
+module.exports = { PRIMITIVES, Timing };
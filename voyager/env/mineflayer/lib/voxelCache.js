@@ -0,0 +1,156 @@
+const { Vec3 } = require("vec3");
+const { getWorldMap } = require("./worldMap");
+
+// Block names in a box around the bot, kept up to date from blockUpdate and
+// chunk loads instead of rescanning every cell on each observation. Cells are
+// stored in a ring buffer indexed by world coordinates, so moving the box only
+// touches the cells that enter or leave it.
+class VoxelCache {
+    constructor(bot, xDistance = 8, yDistance = 2, zDistance = 8) {
+        this.bot = bot;
+        this.xDistance = xDistance;
+        this.yDistance = yDistance;
+        this.zDistance = zDistance;
+        this.width = 2 * xDistance + 1;
+        this.height = 2 * yDistance + 1;
+        this.depth = 2 * zDistance + 1;
+        this.cells = new Array(this.width * this.height * this.depth).fill(
+            null
+        );
+        // block name -> number of cells holding it
+        this.counts = new Map();
+        this.center = null;
+        this.cursor = new Vec3(0, 0, 0);
+        // everything read here is remembered beyond the box as well
+        this.worldMap = getWorldMap(bot);
+
+        bot.on("blockUpdate", (oldBlock, newBlock) => {
+            if (newBlock) this.onBlockUpdate(newBlock.position);
+        });
+        bot.on("chunkColumnLoad", (point) => this.onChunkChange(point));
+        bot.on("chunkColumnUnload", (point) => this.onChunkChange(point));
+    }
+
+    index(x, y, z) {
+        const mod = (a, n) => ((a % n) + n) % n;
+        return (
+            (mod(x, this.width) * this.height + mod(y, this.height)) *
+                this.depth +
+            mod(z, this.depth)
+        );
+    }
+
+    contains(x, y, z, center = this.center) {
+        return (
+            center !== null &&
+            Math.abs(x - center.x) <= this.xDistance &&
+            Math.abs(y - center.y) <= this.yDistance &&
+            Math.abs(z - center.z) <= this.zDistance
+        );
+    }
+
+    readCell(x, y, z) {
+        const block = this.bot.blockAt(this.cursor.set(x, y, z));
+        this.worldMap.recordBlock(block);
+        this.setCell(x, y, z, block && block.type !== 0 ? block.name : null);
+    }
+
+    setCell(x, y, z, name) {
+        const i = this.index(x, y, z);
+        const old = this.cells[i];
+        if (old === name) return;
+        if (old !== null) {
+            const count = this.counts.get(old) - 1;
+            if (count === 0) this.counts.delete(old);
+            else this.counts.set(old, count);
+        }
+        if (name !== null) {
+            this.counts.set(name, (this.counts.get(name) || 0) + 1);
+        }
+        this.cells[i] = name;
+    }
+
+    forEachCell(center, callback) {
+        const { xDistance, yDistance, zDistance } = this;
+        for (let x = center.x - xDistance; x <= center.x + xDistance; x++) {
+            for (let y = center.y - yDistance; y <= center.y + yDistance; y++) {
+                for (let z = center.z - zDistance; z <= center.z + zDistance; z++) {
+                    callback(x, y, z);
+                }
+            }
+        }
+    }
+
+    // Move the box to the bot, reading only the cells that entered it
+    sync() {
+        const center = this.bot.entity.position.floored();
+        const old = this.center;
+        if (old !== null && old.equals(center)) return;
+        if (old !== null) {
+            this.forEachCell(old, (x, y, z) => {
+                if (!this.contains(x, y, z, center)) {
+                    this.setCell(x, y, z, null);
+                }
+            });
+        }
+        this.center = center;
+        this.forEachCell(center, (x, y, z) => {
+            if (!this.contains(x, y, z, old)) this.readCell(x, y, z);
+        });
+    }
+
+    onBlockUpdate(position) {
+        if (this.contains(position.x, position.y, position.z)) {
+            this.readCell(position.x, position.y, position.z);
+        }
+    }
+
+    onChunkChange(point) {
+        if (this.center === null) return;
+        this.forEachCell(this.center, (x, y, z) => {
+            if (
+                x >= point.x &&
+                x < point.x + 16 &&
+                z >= point.z &&
+                z < point.z + 16
+            ) {
+                this.readCell(x, y, z);
+            }
+        });
+    }
+
+    // Names of all non-air blocks in the box, or within a smaller
+    // horizontal radius of the bot
+    names(radius = null) {
+        this.sync();
+        if (
+            radius === null ||
+            radius === undefined ||
+            (radius >= this.xDistance && radius >= this.zDistance)
+        ) {
+            return new Set(this.counts.keys());
+        }
+        const names = new Set();
+        const { x: cx, y: cy, z: cz } = this.center;
+        const xRadius = Math.min(radius, this.xDistance);
+        const zRadius = Math.min(radius, this.zDistance);
+        for (let x = cx - xRadius; x <= cx + xRadius; x++) {
+            for (let y = cy - this.yDistance; y <= cy + this.yDistance; y++) {
+                for (let z = cz - zRadius; z <= cz + zRadius; z++) {
+                    const name = this.cells[this.index(x, y, z)];
+                    if (name !== null) names.add(name);
+                }
+            }
+        }
+        return names;
+    }
+}
+
+function getVoxelCache(bot) {
+    if (!bot.voxelCache) {
+        bot.voxelCache = new VoxelCache(bot);
+    }
+    return bot.voxelCache;
+}
+
+module.exports = { VoxelCache, getVoxelCache };
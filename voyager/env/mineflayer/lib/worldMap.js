@@ -0,0 +1,134 @@
+const { Vec3 } = require("vec3");
+
+const SECTION_SIZE = 16 * 16 * 16;
+// block updates are only remembered this close to the bot, as far as the
+// findBlocks of mineBlock looks
+const OBSERVED_RADIUS = 32;
+
+function sectionKey(x, y, z) {
+    return `${x >> 4},${y >> 4},${z >> 4}`;
+}
+
+function sectionIndex(x, y, z) {
+    return ((y & 15) << 8) | ((z & 15) << 4) | (x & 15);
+}
+
+// Positions of every block the bot has observed, kept for the whole session.
+// Each 16x16x16 chunk section stores block ids in a typed array and is only
+// allocated once something in it was seen, and an index of which sections
+// hold which block ids keeps nearest-block queries from scanning the world.
+class WorldMap {
+    constructor(bot) {
+        this.bot = bot;
+        // section key -> Uint16Array of block ids, 0 for air or unknown
+        this.sections = new Map();
+        // block id -> Map of section key -> number of such blocks in it
+        this.sectionsByType = new Map();
+
+        bot.on("blockUpdate", (oldBlock, newBlock) => {
+            if (newBlock && this.observed(newBlock.position)) {
+                this.record(newBlock.position, newBlock.type);
+            }
+        });
+    }
+
+    observed(position) {
+        return (
+            Boolean(this.bot.entity) &&
+            this.bot.entity.position.distanceTo(position) <= OBSERVED_RADIUS
+        );
+    }
+
+    record(position, type) {
+        const { x, y, z } = position;
+        const key = sectionKey(x, y, z);
+        let section = this.sections.get(key);
+        if (!section) {
+            if (type === 0) return;
+            section = new Uint16Array(SECTION_SIZE);
+            this.sections.set(key, section);
+        }
+        const i = sectionIndex(x, y, z);
+        const old = section[i];
+        if (old === type) return;
+        if (old !== 0) this.count(old, key, -1);
+        if (type !== 0) this.count(type, key, 1);
+        section[i] = type;
+    }
+
+    recordBlock(block) {
+        if (block) this.record(block.position, block.type);
+    }
+
+    count(type, key, delta) {
+        let sections = this.sectionsByType.get(type);
+        if (!sections) {
+            sections = new Map();
+            this.sectionsByType.set(type, sections);
+        }
+        const count = (sections.get(key) || 0) + delta;
+        if (count > 0) sections.set(key, count);
+        else sections.delete(key);
+    }
+
+    // Closest remembered positions of a block, nearest first. Sections are
+    // scanned closest first, and the scan stops at the first section that is
+    // farther away than maxDistance or than the count closest blocks found.
+    nearest(name, from, { count = 1, maxDistance = Infinity } = {}) {
+        const block = this.bot.registry.blocksByName[name];
+        const sections = block && this.sectionsByType.get(block.id);
+        if (!sections) return [];
+        const candidates = [];
+        sections.forEach((_, key) => {
+            const [sx, sy, sz] = key.split(",").map(Number);
+            const distance = sectionDistance(sx, sy, sz, from);
+            if (distance <= maxDistance) candidates.push({ key, distance });
+        });
+        candidates.sort((a, b) => a.distance - b.distance);
+        const found = [];
+        for (const candidate of candidates) {
+            if (
+                found.length >= count &&
+                candidate.distance > found[count - 1].distance
+            ) {
+                break;
+            }
+            const [sx, sy, sz] = candidate.key.split(",").map(Number);
+            const section = this.sections.get(candidate.key);
+            for (let i = 0; i < SECTION_SIZE; i++) {
+                if (section[i] !== block.id) continue;
+                const position = new Vec3(
+                    (sx << 4) | (i & 15),
+                    (sy << 4) | (i >> 8),
+                    (sz << 4) | ((i >> 4) & 15)
+                );
+                const distance = position.distanceTo(from);
+                if (distance <= maxDistance) found.push({ position, distance });
+            }
+            found.sort((a, b) => a.distance - b.distance);
+        }
+        return found.slice(0, count).map(({ position }) => position);
+    }
+}
+
+// Distance from a point to the closest block of a section
+function sectionDistance(sx, sy, sz, from) {
+    const axis = (section, value) => {
+        const min = section << 4;
+        return Math.max(min - value, 0, value - (min + 15));
+    };
+    return Math.hypot(
+        axis(sx, from.x),
+        axis(sy, from.y),
+        axis(sz, from.z)
+    );
+}
+
+function getWorldMap(bot) {
+    if (!bot.worldMap) {
+        bot.worldMap = new WorldMap(bot);
+    }
+    return bot.worldMap;
+}
+
+module.exports = { WorldMap, getWorldMap };
@@ -0,0 +1,517 @@
+"""
+A stand-in for the mineflayer bridge that needs neither Minecraft nor node.
+
+It serves /start, /step, /pause, /stop, /programs and /cancel (also under
+/bots/<bot_name>/) with the event schema of mineflayer/index.js, driven by a
+scripted, deterministic world. Submitted code is not executed: the control
+primitives and bot.chat calls it reaches, following calls into the functions
+defined in the programs and the code, are applied to the world in source order.
+Only the observers and events keys of an observation profile are honored.
+
+Run it like the real bridge, with a port or a unix socket path:
+    python mock_bridge.py 3000
+"""
+import hashlib
+import json
+import os
+import re
+import socketserver
+import stat
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_TYPE = "application/msgpack"
+
+# observers in the order mineflayer computes them
+OBSERVERS = [
+    "onChat",
+    "onError",
+    "voxels",
+    "status",
+    "inventory",
+    "onSave",
+    "nearbyChests",
+    "blockRecords",
+]
+
+CALL_PATTERN = re.compile(
+    r"bot\.chat\(\s*([\"'`])(?P<chat>.*?)\1\s*\)|\b(?P<name>[A-Za-z_]\w*)\s*\("
+)
+FUNCTION_PATTERN = re.compile(r"(?:async\s+)?function\s+(?P<name>\w+)\s*\(")
+
+
+def find_block_end(code, start):
+    """
+    :return: index just past the brace block starting at the first "{" after start
+    """
+    depth = 0
+    for i in range(code.index("{", start), len(code)):
+        if code[i] == "{":
+            depth += 1
+        elif code[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return len(code)
+
+
+def split_functions(code):
+    """
+    :return: the function bodies defined in code by name, and code without them
+    """
+    functions = {}
+    remainder = []
+    position = 0
+    for match in FUNCTION_PATTERN.finditer(code):
+        if match.start() < position:
+            continue
+        end = find_block_end(code, match.end())
+        functions[match.group("name")] = code[match.end() : end]
+        remainder.append(code[position : match.start()])
+        position = end
+    remainder.append(code[position:])
+    return functions, "".join(remainder)
+
+
+def split_call_args(code, start):
+    """
+    :return: source text of the arguments of the call whose "(" ends at start
+    """
+    depth = 1
+    args = []
+    current = ""
+    for char in code[start:]:
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+            if depth == 0:
+                break
+        if char == "," and depth == 1:
+            args.append(current.strip())
+            current = ""
+        else:
+            current += char
+    args.append(current.strip())
+    return args
+
+
+def literal_value(arg):
+    """
+    :return: the value of a string or number literal, None for anything else
+    """
+    if len(arg) >= 2 and arg[0] in "\"'`" and arg[-1] == arg[0]:
+        return arg[1:-1]
+    if re.fullmatch(r"-?\d+(\.\d+)?", arg):
+        return float(arg) if "." in arg else int(arg)
+    return None
+
+
+def iter_calls(code, functions, depth=0):
+    """
+    Yield ("chat", message) and (name, argument sources) for the calls code makes,
+    descending into the bodies of functions it calls.
+    """
+    for match in CALL_PATTERN.finditer(code):
+        if match.group("chat") is not None:
+            yield "chat", match.group("chat")
+            continue
+        name = match.group("name")
+        if name in functions:
+            if depth < 8:
+                yield from iter_calls(functions[name], functions, depth + 1)
+        else:
+            yield name, split_call_args(code, match.end())
+
+
+class MockWorld:
+    """
+    Deterministic state of one bot. The same requests always produce the same events.
+    """
+
+    DROPS = {
+        "stone": "cobblestone",
+        "grass_block": "dirt",
+        "coal_ore": "coal",
+        "iron_ore": "raw_iron",
+        "gold_ore": "raw_gold",
+        "diamond_ore": "diamond",
+        "redstone_ore": "redstone",
+        "lapis_ore": "lapis_lazuli",
+    }
+    SMELTS = {
+        "raw_iron": "iron_ingot",
+        "raw_gold": "gold_ingot",
+        "sand": "glass",
+        "cobblestone": "stone",
+    }
+    VOXELS = ["grass_block", "dirt", "stone", "oak_log", "oak_leaves", "coal_ore"]
+    # game ticks each primitive takes
+    TICKS = {
+        "mineBlock": 40,
+        "craftItem": 10,
+        "smeltItem": 200,
+        "placeItem": 20,
+        "killMob": 100,
+        "exploreUntil": 400,
+    }
+    # times of day a reset with time "next" moves through, like getNextTime
+    TIME_CYCLE = list(range(0, 13000, 1000)) + list(range(13000, 24000, 2000))
+
+    def __init__(self, bot_name="bot"):
+        self.bot_name = bot_name
+        self.inventory = {}
+        self.equipment = [None] * 6
+        self.position = {"x": 0.5, "y": 64.0, "z": 0.5}
+        self.time_of_day = 1000
+        self.elapsed_time = 0
+        self.health = 20.0
+        self.food = 20.0
+        self.biome = "plains"
+        # mob name -> distance
+        self.entities = {"pig": 12.5}
+        self.chests = {}
+        self.block_records = []
+        # items placed during the last step, in order
+        self.journal = []
+        # profile set on reset, merged under the profile of each request like
+        # setObsProfile does
+        self.default_profile = {}
+        self.profile = {}
+        self.events = []
+        self.paused = False
+
+    def reset(self, options):
+        if options.get("reset") == "hard":
+            self.inventory = dict(options.get("inventory") or {})
+            self.equipment = list(options.get("equipment") or [None] * 6)
+            self.health = 20.0
+            self.food = 20.0
+            self.block_records = []
+        if options.get("position"):
+            self.position = dict(options["position"])
+        time_of_day = options.get("time")
+        if time_of_day == "next":
+            time_of_day = self.next_time()
+        if time_of_day is not None:
+            self.time_of_day = int(time_of_day) % 24000
+        self.chests = {}
+        self.journal = []
+        self.elapsed_time = 0
+        self.events = []
+
+    def rollback(self):
+        """
+        Give back the blocks placed during the last step, like /rollback.
+        :return: number of blocks taken back
+        """
+        journal, self.journal = self.journal, []
+        for name in journal:
+            self.add_item(name, 1)
+        return len(journal)
+
+    def next_time(self):
+        later = [t for t in self.TIME_CYCLE if t > self.time_of_day]
+        return later[0] if later else self.TIME_CYCLE[0]
+
+    def time_name(self):
+        for bound, name in [
+            (1000, "sunrise"),
+            (6000, "day"),
+            (12000, "noon"),
+            (13000, "sunset"),
+            (18000, "night"),
+            (22000, "midnight"),
+        ]:
+            if self.time_of_day < bound:
+                return name
+        return "sunrise"
+
+    def status(self):
+        return {
+            "health": self.health,
+            "food": self.food,
+            "saturation": 5.0,
+            "oxygen": 20,
+            "position": dict(self.position),
+            "velocity": {"x": 0, "y": -0.0784, "z": 0},
+            "yaw": 0.0,
+            "pitch": 0.0,
+            "onGround": True,
+            "equipment": list(self.equipment),
+            "name": self.bot_name,
+            "timeSinceOnGround": 0,
+            "isInWater": False,
+            "isInLava": False,
+            "isInWeb": False,
+            "isCollidedHorizontally": False,
+            "isCollidedVertically": True,
+            "biome": self.biome,
+            "entities": dict(self.entities),
+            "timeOfDay": self.time_name(),
+            "inventoryUsed": sum(-(-count // 64) for count in self.inventory.values()),
+            "elapsedTime": self.elapsed_time,
+        }
+
+    def voxels(self):
+        return list(self.VOXELS)
+
+    def observe(self, name):
+        if name == "voxels":
+            return self.voxels()
+        if name == "status":
+            return self.status()
+        if name == "inventory":
+            return dict(self.inventory)
+        if name == "nearbyChests":
+            return dict(self.chests)
+        if name == "blockRecords":
+            return list(self.block_records)
+
+    def set_profile(self, profile=None):
+        self.profile = {**self.default_profile, **(profile or {})}
+
+    def event(self, event_name, value=None):
+        observers = self.profile.get("observers")
+        recorded = event_name == "observe" or event_name in self.profile.get(
+            "events", [event_name]
+        )
+        if not recorded:
+            return
+        result = {}
+        for name in OBSERVERS:
+            if name.startswith("on"):
+                if name == event_name:
+                    result[name] = value
+            elif observers is None or name in observers:
+                result[name] = self.observe(name)
+        self.events.append([event_name, result])
+
+    def take_events(self):
+        self.event("observe")
+        events, self.events = self.events, []
+        return events
+
+    def chat(self, message):
+        if message.startswith("/time set "):
+            try:
+                self.time_of_day = int(message.split()[-1]) % 24000
+            except ValueError:
+                pass
+        if not message.startswith("/"):
+            self.event("onChat", message)
+
+    def advance(self, ticks):
+        self.elapsed_time += ticks
+        self.time_of_day = (self.time_of_day + ticks) % 24000
+
+    def add_item(self, name, count):
+        self.inventory[name] = self.inventory.get(name, 0) + count
+        if self.inventory[name] <= 0:
+            del self.inventory[name]
+
+    def apply(self, name, args):
+        """
+        Apply one control primitive call, anything else is ignored.
+        """
+        args = [literal_value(arg) for arg in args] + [None] * 3
+        if name not in self.TICKS or not isinstance(args[1], str):
+            return
+        self.advance(self.TICKS[name])
+        if name == "mineBlock":
+            count = args[2] if isinstance(args[2], int) else 1
+            self.add_item(self.DROPS.get(args[1], args[1]), count)
+            if args[1] not in self.block_records:
+                self.block_records.append(args[1])
+            self.event("onSave", f"{args[1]}_mined")
+        elif name == "craftItem":
+            count = args[2] if isinstance(args[2], int) else 1
+            self.add_item(args[1], count)
+            self.event("onChat", f"I did the recipe for {args[1]} {count} times")
+        elif name == "smeltItem":
+            count = args[3] if isinstance(args[3], int) else 1
+            if self.inventory.get(args[1], 0) < count:
+                self.event("onChat", f"No {args[1]} to smelt in inventory")
+                return
+            self.add_item(args[1], -count)
+            self.add_item(self.SMELTS.get(args[1], args[1]), count)
+            self.event("onChat", f"Smelted {count} {args[1]}.")
+        elif name == "placeItem":
+            if self.inventory.get(args[1], 0) < 1:
+                self.event("onChat", f"No {args[1]} in inventory")
+                return
+            self.add_item(args[1], -1)
+            self.journal.append(args[1])
+            self.event("onChat", f"Placed {args[1]}")
+            self.event("onSave", f"{args[1]}_placed")
+        elif name == "killMob":
+            self.event("onSave", f"{args[1]}_killed")
+        elif name == "exploreUntil":
+            self.position["x"] += 16
+            self.event("onChat", "Explore success.")
+
+    def run(self, code, programs=""):
+        # like globalTickCounter, elapsedTime counts the ticks of this step only
+        self.elapsed_time = 0
+        self.journal = []
+        functions, _ = split_functions(programs)
+        code_functions, top_level = split_functions(code)
+        functions.update(code_functions)
+        for name, args in iter_calls(top_level, functions):
+            if name == "chat":
+                self.chat(args)
+            else:
+                self.apply(name, args)
+
+
+class MockBridge:
+    def __init__(self):
+        self.worlds = {}
+        self.last_bot_name = None
+        self.programs = {}
+        self.lock = threading.Lock()
+
+    def world(self, bot_name):
+        return self.worlds.get(bot_name or self.last_bot_name)
+
+    def handle(self, action, bot_name, body):
+        """
+        :return: (status code, response data)
+        """
+        if action == "programs":
+            for program_hash, program in (body.get("programs") or {}).items():
+                if hashlib.sha256(program.encode("utf-8")).hexdigest() != program_hash:
+                    return 400, {"error": f"Hash mismatch for program {program_hash}"}
+                self.programs[program_hash] = program
+            added = len(body.get("programs") or {})
+            return 200, {"added": added, "total": len(self.programs)}
+        bot_name = bot_name or body.get("bot_name")
+        if action == "start":
+            bot_name = bot_name or "bot"
+            world = self.worlds.setdefault(bot_name, MockWorld(bot_name))
+            world.reset(body)
+            world.default_profile = body.get("observation") or {}
+            world.set_profile()
+            world.paused = bool(body.get("pause_after"))
+            self.last_bot_name = bot_name
+            return 200, world.take_events()
+        world = self.world(bot_name)
+        if world is None:
+            return 400, {"error": "Bot not spawned"}
+        if action == "step":
+            if "program_hashes" in body:
+                missing = [h for h in body["program_hashes"] if h not in self.programs]
+                if missing:
+                    return 409, {"error": "Unknown programs", "missing": missing}
+                programs = "\n".join(self.programs[h] for h in body["program_hashes"])
+            else:
+                programs = body.get("programs") or ""
+            world.set_profile(body.get("observation"))
+            world.run(body.get("code") or "", programs)
+            world.paused = bool(body.get("pause_after"))
+            return 200, world.take_events()
+        if action == "rollback":
+            world.set_profile(
+                {
+                    "observers": ["inventory", "voxels"],
+                    "events": [],
+                    **(body.get("observation") or {}),
+                }
+            )
+            world.rollback()
+            world.paused = bool(body.get("pause_after"))
+            return 200, world.take_events()
+        if action == "pause":
+            world.paused = body.get("paused", not world.paused)
+            return 200, {"message": "Success", "paused": world.paused}
+        if action == "cancel":
+            return 200, {"cancelled": False}
+        if action == "stop":
+            self.worlds.pop(bot_name or self.last_bot_name, None)
+            return 200, {"message": "Bot stopped"}
+        return 404, {"error": f"Unknown route {action}"}
+
+
+class MockBridgeHandler(BaseHTTPRequestHandler):
+    bridge = MockBridge()
+
+    def address_string(self):
+        # clients of a unix socket have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        print(format % args, flush=True)
+
+    def do_POST(self):
+        match = re.fullmatch(r"(?:/bots/(?P<bot>[^/]+))?/(?P<action>\w+)", self.path)
+        if not match:
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        with self.bridge.lock:
+            status, data = self.bridge.handle(
+                match.group("action"), match.group("bot"), body
+            )
+        if status == 200 and match.group("action") in ("start", "step"):
+            if body.get("stream"):
+                self.send_stream(data)
+                return
+            if body.get("metadata"):
+                data = {"events": data, "metadata": {}}
+        self.send_data(status, data)
+
+    def send_data(self, status, data):
+        if msgpack is not None and MSGPACK_TYPE in self.headers.get("Accept", ""):
+            content_type, content = MSGPACK_TYPE, msgpack.packb(data)
+        else:
+            content_type = "application/json; charset=utf-8"
+            content = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def send_stream(self, events):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        for event in events + [["end", None]]:
+            data = json.dumps(event if event[0] != "end" else None)
+            self.wfile.write(f"event: {event[0]}\ndata: {data}\n\n".encode("utf-8"))
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def main(port="3000"):
+    if port.isdigit():
+        server = ThreadingHTTPServer(("127.0.0.1", int(port)), MockBridgeHandler)
+        print(f"Server started on port {port}", flush=True)
+    else:
+        # a socket file left behind by a crashed bridge would make bind fail,
+        # anything else at that path is not ours to delete
+        if os.path.lexists(port):
+            if not stat.S_ISSOCK(os.lstat(port).st_mode):
+                print(f"{port} exists and is not a socket", file=sys.stderr)
+                sys.exit(1)
+            os.remove(port)
+        server = UnixHTTPServer(port, MockBridgeHandler)
+        print(f"Server started on socket {port}", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "3000")
@@ -21,6 +21,7 @@ class SubprocessMonitor:
         callback_match: str = r"^(?!x)x$",  # regex that will never match
         callback: callable = None,
         finished_callback: callable = None,
+        standby_commands: List[str] = None,
     ):
         self.commands = commands
         start_time = time.strftime("%Y%m%d_%H%M%S")
@@ -41,37 +42,81 @@ class SubprocessMonitor:
         self.callback = callback
         self.finished_callback = finished_callback
         self.thread = None
+        # a warm second process that takes over when this one dies
+        self.standby = None
+        if standby_commands:
+            self.standby = SubprocessMonitor(
+                commands=standby_commands,
+                name=f"{name}_standby",
+                ready_match=ready_match,
+                log_path=log_path,
+                callback_match=callback_match,
+                callback=callback,
+                finished_callback=finished_callback,
+            )
 
-    def _start(self):
-        self.logger.info(f"Starting subprocess with commands: {self.commands}")
-
-        self.process = psutil.Popen(
-            self.commands,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            universal_newlines=True,
-        )
-        print(f"Subprocess {self.name} started with PID {self.process.pid}.")
-        for line in iter(self.process.stdout.readline, ""):
+    def _start(self, process, ready_event):
+        print(f"Subprocess {self.name} started with PID {process.pid}.")
+        for line in iter(process.stdout.readline, ""):
             self.logger.info(line.strip())
             if re.search(self.ready_match, line):
                 self.ready_line = line
                 self.logger.info("Subprocess is ready.")
-                self.ready_event.set()
+                ready_event.set()
             if re.search(self.callback_match, line):
                 self.callback()
-        if not self.ready_event.is_set():
-            self.ready_event.set()
+        if not ready_event.is_set():
+            ready_event.set()
             warnings.warn(f"Subprocess {self.name} failed to start.")
         if self.finished_callback:
             self.finished_callback()
 
-    def run(self):
+    def run(self, wait=True):
+        self.logger.info(f"Starting subprocess with commands: {self.commands}")
         self.ready_event = threading.Event()
         self.ready_line = None
-        self.thread = threading.Thread(target=self._start)
+        self.process = psutil.Popen(
+            self.commands,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+        )
+        self.thread = threading.Thread(
+            target=self._start, args=(self.process, self.ready_event)
+        )
         self.thread.start()
-        self.ready_event.wait()
+        if wait:
+            self.ready_event.wait()
+            self.start_standby()
+
+    def start_standby(self):
+        """
+        Boot the standby in the background if it is not up already.
+        """
+        if self.standby is not None and not self.standby.is_running:
+            self.standby.run(wait=False)
+
+    def promote_standby(self):
+        """
+        Replace the process with the standby, which is already booted, and start a
+        new standby with the commands of the replaced process.
+        :return: whether a standby took over
+        """
+        standby = self.standby
+        if standby is None or standby.process is None:
+            return False
+        standby.ready_event.wait()
+        if not standby.is_running:
+            return False
+        self.stop()
+        self.logger.info(f"Promoting standby with PID {standby.process.pid}.")
+        self.process, standby.process = standby.process, None
+        self.thread, standby.thread = standby.thread, None
+        self.ready_event = standby.ready_event
+        self.ready_line = standby.ready_line
+        self.commands, standby.commands = standby.commands, self.commands
+        self.start_standby()
+        return True
 
     def stop(self):
         self.logger.info("Stopping subprocess.")
@@ -79,6 +124,10 @@ class SubprocessMonitor:
             self.process.terminate()
             self.process.wait()
 
+    def stop_standby(self):
+        if self.standby is not None:
+            self.standby.stop()
+
     # def __del__(self):
     #     if self.process.is_running():
     #         self.stop()
@@ -0,0 +1,254 @@
+import asyncio
+import copy
+from typing import Any, Dict, List, Union
+
+import gymnasium as gym
+
+import voyager.utils as U
+from voyager.utils.record_utils import record_task, sorted_records
+
+
+class ReplayDivergence(RuntimeError):
+    """
+    Raised when a replayed step runs code other than the recorded step did and
+    there is no fallback environment to continue in.
+    """
+
+    def __init__(self, iteration, task, expected, actual):
+        super().__init__(
+            f"Replay diverged at iteration {iteration} ({task}): the recorded step ran\n"
+            f"{expected}\nbut got\n{actual}"
+        )
+        self.iteration = iteration
+        self.task = task
+        self.expected = expected
+        self.actual = actual
+
+
+class ReplayEnv(gym.Env):
+    """
+    Serves the events EventRecorder dumped under ckpt_dir/events back in order,
+    with the interface of VoyagerEnv and AsyncVoyagerEnv, so agent and prompt
+    changes can be run against a recorded trajectory without Minecraft.
+
+    Voyager sends the skill programs with the action agent's code and with
+    nothing else, so steps with programs and no observation profile are served
+    the next recorded step, keyed by task and iteration. Resets and other steps
+    get the latest observation back.
+
+    With until_divergence, the code of each served step is compared with the
+    code recorded for it. On the first mismatch the replay hands over to
+    fallback_env, reset to the recorded inventory, equipment and position, or
+    raises ReplayDivergence without one.
+
+    The recording holds no reset observations. Replaying from the first iteration,
+    resets are served the first event of the first recorded step, which was taken
+    during that step and can already show some of its results, e.g. mined logs.
+    """
+
+    def __init__(
+        self,
+        ckpt_dir="ckpt",
+        start_iteration=1,
+        until_divergence=False,
+        fallback_env=None,
+        bot_name="bot",
+    ):
+        """
+        :param ckpt_dir: checkpoint dir of the bot, e.g. ckpt/bot
+        :param start_iteration: first recorded iteration to serve, earlier ones are skipped
+        :param until_divergence: whether to stop replaying once the code of a step differs from the recording
+        :param fallback_env: environment that takes over from the recorded state after a divergence
+        :param bot_name: name of the replayed bot
+        """
+        self.ckpt_dir = ckpt_dir
+        self.until_divergence = until_divergence
+        self.fallback_env = fallback_env
+        self.bot_name = bot_name
+        self.records = self.load_records(ckpt_dir)
+        # empty records are failed parses of the action agent, they took no step
+        self.pending = [
+            record
+            for record in self.records
+            if record["events"] and record["iteration"] >= start_iteration
+        ]
+        served = [
+            record
+            for record in self.records
+            if record["events"] and record["iteration"] < start_iteration
+        ]
+        if served:
+            self.last_observation = served[-1]["events"][-1][1]
+        elif self.pending:
+            # closest to the reset there is, see the class docstring
+            self.last_observation = self.pending[0]["events"][0][1]
+        else:
+            raise ValueError(f"No recorded events to replay in {ckpt_dir}")
+        self.cursor = 0
+        # the step that did not match the recording, see ReplayDivergence
+        self.divergence = None
+        self.has_reset = False
+        self.reset_options = None
+        self.last_metadata = None
+        self.step_setup_ms = None
+
+    @staticmethod
+    def load_records(ckpt_dir):
+        """
+        :return: the recorded steps in order, each with its task, iteration, events
+        and the code that produced them if it was recorded
+        """
+        records = []
+        for iteration, record in enumerate(sorted_records(ckpt_dir), start=1):
+            code = None
+            if U.f_exists(ckpt_dir, "code", record):
+                code = U.load_text(ckpt_dir, "code", record)
+            records.append(
+                {
+                    "task": record_task(record),
+                    "iteration": iteration,
+                    "events": U.decode_events(
+                        U.load_json(U.f_join(ckpt_dir, "events", record))
+                    ),
+                    "code": code,
+                }
+            )
+        return records
+
+    @property
+    def diverged(self):
+        return self.divergence is not None
+
+    @property
+    def done(self):
+        return self.cursor >= len(self.pending)
+
+    def observation(self):
+        return [["observe", copy.deepcopy(self.last_observation)]]
+
+    @staticmethod
+    def same_code(expected, actual):
+        return expected.split() == actual.split()
+
+    @staticmethod
+    def is_recorded_step(programs, observation):
+        return bool(programs) and observation is None
+
+    def replay(self, code):
+        """
+        :return: events of the next recorded step, or None if the step diverged
+        """
+        if self.done:
+            raise RuntimeError(
+                f"All {len(self.pending)} recorded steps in {self.ckpt_dir} were replayed"
+            )
+        record = self.pending[self.cursor]
+        if (
+            self.until_divergence
+            and record["code"] is not None
+            and not self.same_code(record["code"], code)
+        ):
+            divergence = {
+                "iteration": record["iteration"],
+                "task": record["task"],
+                "expected": record["code"],
+                "actual": code,
+            }
+            if self.fallback_env is None:
+                raise ReplayDivergence(**divergence)
+            self.divergence = divergence
+            return None
+        self.cursor += 1
+        self.last_observation = record["events"][-1][1]
+        return copy.deepcopy(record["events"])
+
+    def fallback_reset_options(self):
+        """
+        The fallback environment starts from the last observation of the replay.
+        """
+        options = {
+            "mode": "hard",
+            "bot_name": self.bot_name,
+            "inventory": self.last_observation.get("inventory", {}),
+        }
+        if "status" in self.last_observation:
+            options["equipment"] = self.last_observation["status"]["equipment"]
+            options["position"] = self.last_observation["status"]["position"]
+        if self.reset_options:
+            options["wait_ticks"] = self.reset_options.get("wait_ticks", 5)
+        return options
+
+    def render(self):
+        raise NotImplementedError("render is not implemented")
+
+    def reset(self, *, seed=None, options=None):
+        if self.diverged:
+            return self.fallback_env.reset(seed=seed, options=options)
+        self.reset_options = options or {}
+        self.bot_name = self.reset_options.get("bot_name", self.bot_name)
+        self.has_reset = True
+        return self.observation()
+
+    def step(
+        self,
+        code: str,
+        programs: Union[str, List[str]] = "",
+        observation: Dict[str, Any] = None,
+        movements: Dict[str, Any] = None,
+    ):
+        if not self.has_reset:
+            raise RuntimeError("Environment has not been reset yet")
+        if not self.diverged:
+            if not self.is_recorded_step(programs, observation):
+                return self.observation()
+            events = self.replay(code)
+            if events is not None:
+                return events
+            self.fallback_env.reset(options=self.fallback_reset_options())
+        return self.fallback_env.step(
+            code, programs=programs, observation=observation, movements=movements
+        )
+
+    def close(self):
+        if self.fallback_env is not None:
+            return self.fallback_env.close()
+        return True
+
+    async def areset(self, *, seed=None, options=None):
+        if self.diverged and hasattr(self.fallback_env, "areset"):
+            return await self.fallback_env.areset(seed=seed, options=options)
+        return self.reset(seed=seed, options=options)
+
+    async def astep(
+        self,
+        code: str,
+        programs: Union[str, List[str]] = "",
+        observation: Dict[str, Any] = None,
+        movements: Dict[str, Any] = None,
+    ):
+        if not self.has_reset:
+            raise RuntimeError("Environment has not been reset yet")
+        if not self.diverged:
+            if not self.is_recorded_step(programs, observation):
+                return self.observation()
+            events = self.replay(code)
+            if events is not None:
+                return events
+            if hasattr(self.fallback_env, "areset"):
+                await self.fallback_env.areset(options=self.fallback_reset_options())
+            else:
+                await asyncio.to_thread(
+                    self.fallback_env.reset, options=self.fallback_reset_options()
+                )
+        if hasattr(self.fallback_env, "astep"):
+            return await self.fallback_env.astep(
+                code, programs=programs, observation=observation, movements=movements
+            )
+        return await asyncio.to_thread(
+            self.fallback_env.step, code, programs, observation, movements
+        )
+
+    async def aclose(self):
+        if hasattr(self.fallback_env, "aclose"):
+            return await self.fallback_env.aclose()
+        return self.close()
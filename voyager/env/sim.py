@@ -0,0 +1,479 @@
+import math
+import re
+from typing import Any, Dict, List, Union
+
+import gymnasium as gym
+
+from .mock_bridge import MockWorld, literal_value
+from .sim_data import (
+    BIOMES,
+    BLOCKS,
+    FUELS,
+    MOBS,
+    RECIPES,
+    SMELTING,
+    TAGS,
+    TOOL_SPEEDS,
+    TOOL_TIERS,
+)
+
+KNOWN_ITEMS = (
+    set(RECIPES)
+    | set(SMELTING)
+    | set(SMELTING.values())
+    | set(FUELS)
+    | set(BLOCKS)
+    | {block["drop"] for block in BLOCKS.values() if block["drop"]}
+    | {item for drops in MOBS.values() for item in drops}
+    | {
+        ingredient
+        for recipes in RECIPES.values()
+        for recipe in recipes
+        for ingredient in recipe["ingredients"]
+        if not ingredient.startswith("#")
+    }
+)
+VEC3_PATTERN = re.compile(r"Vec3\(\s*(-?\d+)\s*,\s*(-?\d+)\s*,\s*(-?\d+)\s*\)")
+
+
+def ingredient_items(ingredient):
+    return TAGS[ingredient[1:]] if ingredient.startswith("#") else [ingredient]
+
+
+def string_arg(args, index):
+    value = literal_value(args[index]) if index < len(args) else None
+    return value if isinstance(value, str) else None
+
+
+def count_arg(args, index, default=1):
+    value = literal_value(args[index]) if index < len(args) else None
+    return value if isinstance(value, int) else default
+
+
+class SimError(Exception):
+    """
+    An error the control primitive would throw in mineflayer, ends the step.
+    """
+
+
+class SimWorld(MockWorld):
+    """
+    Inventory, crafting and mining of one bot, computed from the tables in sim_data.
+
+    The code of a step is interpreted abstractly: the control primitives it
+    reaches are applied once each in source order, through the functions the
+    programs define, with the game ticks and chat messages of their mineflayer
+    versions. Loops and branches are not evaluated, and arguments that are not
+    literals fall back to defaults, or skip the call if they name an item.
+    """
+
+    # game ticks of walking to a block, crafting, one smelt, placing and a fight
+    WALK_TICKS = 20
+    CRAFT_TICKS = 10
+    SMELT_TICKS = 260
+    PLACE_TICKS = 20
+    KILL_TICKS = 100
+    EXPLORE_MOB_TICKS = 300
+    # blocks walked per tick while exploring
+    EXPLORE_SPEED = 0.2
+
+    def __init__(self, bot_name="bot", biome="plains"):
+        super().__init__(bot_name)
+        self.biome = biome
+        self.nearby = set(BIOMES[biome]["blocks"])
+        self.entities = dict(BIOMES[biome]["entities"])
+        # blocks the bot placed during the current step, by name
+        self.placed = {}
+        self.primitives = {
+            "mineBlock": self.mine_block,
+            "craftItem": self.craft_item,
+            "smeltItem": self.smelt_item,
+            "placeItem": self.place_item,
+            "killMob": self.kill_mob,
+            "exploreUntil": self.explore_until,
+            "depositItemIntoChest": self.deposit_item_into_chest,
+        }
+
+    def reset(self, options):
+        chests = self.chests
+        super().reset(options)
+        if options.get("reset") == "hard":
+            self.nearby = set(BIOMES[self.biome]["blocks"])
+            self.entities = dict(BIOMES[self.biome]["entities"])
+        else:
+            self.chests = chests
+        self.placed = {}
+
+    def voxels(self):
+        return sorted(self.nearby | set(self.placed))
+
+    def apply(self, name, args):
+        primitive = self.primitives.get(name)
+        if primitive is not None:
+            primitive(args)
+
+    def run(self, code, programs=""):
+        try:
+            super().run(code, programs)
+        except SimError as err:
+            self.event("onError", str(err))
+        self.return_items()
+
+    def return_items(self):
+        """
+        Take back the crafting tables and furnaces placed during the step, like
+        returnItems in mineflayer.
+        """
+        for name in ["crafting_table", "furnace"]:
+            if self.placed.pop(name, 0):
+                self.add_item(name, 1)
+                # a rollback must not give them back twice
+                self.journal = [placed for placed in self.journal if placed != name]
+        self.placed = {}
+        if self.status()["inventoryUsed"] >= 32 and "chest" not in self.inventory:
+            self.add_item("chest", 1)
+
+    def best_tool(self, kind):
+        """
+        :return: material of the best tool of this kind in the inventory
+        """
+        materials = [
+            material
+            for material in TOOL_SPEEDS
+            if self.inventory.get(f"{material}_{kind}")
+        ]
+        return max(
+            materials,
+            key=lambda material: (TOOL_TIERS[material], TOOL_SPEEDS[material]),
+            default=None,
+        )
+
+    def dig_ticks(self, block):
+        """
+        :return: ticks to dig the block, and whether it drops anything
+        """
+        material = self.best_tool(block["tool"]) if block["tool"] else None
+        speed = TOOL_SPEEDS[material] if material else 1
+        harvest = block["tier"] is None or (
+            material is not None and TOOL_TIERS[material] >= block["tier"]
+        )
+        # 1.5 seconds per hardness when the block drops, 5 when it does not
+        ticks = math.ceil(block["hardness"] * (30 if harvest else 100) / speed)
+        return ticks, harvest
+
+    def available(self, ingredient):
+        return sum(self.inventory.get(item, 0) for item in ingredient_items(ingredient))
+
+    def take(self, ingredient, count):
+        for item in ingredient_items(ingredient):
+            taken = min(count, self.inventory.get(item, 0))
+            if taken:
+                self.add_item(item, -taken)
+                count -= taken
+
+    def missing(self, ingredients):
+        return sum(
+            max(count - self.available(ingredient), 0)
+            for ingredient, count in ingredients.items()
+        )
+
+    def missing_message(self, ingredients):
+        # same wording as failedCraftFeedback
+        message = ""
+        for ingredient, count in ingredients.items():
+            have = self.available(ingredient)
+            if have == 0:
+                message += f" {count} more {ingredient_items(ingredient)[0]}, "
+            elif have < count:
+                item = next(
+                    item
+                    for item in ingredient_items(ingredient)
+                    if self.inventory.get(item)
+                )
+                message += f"{count - have} more {item}"
+        return message
+
+    def mine_block(self, args):
+        name, count = string_arg(args, 1), count_arg(args, 2)
+        if name is None:
+            return
+        block = BLOCKS.get(name)
+        if block is None:
+            raise SimError(f"No block named {name}")
+        if name not in self.nearby:
+            self.chat(f"No {name} nearby, please explore first")
+            return
+        ticks, harvest = self.dig_ticks(block)
+        self.advance(count * (ticks + self.WALK_TICKS))
+        if harvest and block["drop"]:
+            self.add_item(block["drop"], count * block["count"])
+        self.event("onSave", f"{name}_mined")
+
+    def craft_item(self, args):
+        name, count = string_arg(args, 1), count_arg(args, 2)
+        if name is None:
+            return
+        if name not in KNOWN_ITEMS:
+            raise SimError(f"No item named {name}")
+        table = "crafting_table" in self.placed
+        if not table:
+            self.chat("Craft without a crafting table")
+        recipes = [
+            recipe for recipe in RECIPES.get(name, []) if table or not recipe["table"]
+        ]
+        if not recipes:
+            raise SimError("No crafting table nearby")
+        self.advance(self.CRAFT_TICKS + (self.WALK_TICKS if table else 0))
+        recipe = next(
+            (recipe for recipe in recipes if self.missing(recipe["ingredients"]) == 0),
+            None,
+        )
+        if recipe is None:
+            recipe = min(
+                recipes, key=lambda recipe: self.missing(recipe["ingredients"])
+            )
+            self.chat(
+                f"I cannot make {name} because I need: "
+                f"{self.missing_message(recipe['ingredients'])}"
+            )
+            return
+        self.chat(f"I can make {name}")
+        times = min(
+            [count]
+            + [
+                self.available(ingredient) // needed
+                for ingredient, needed in recipe["ingredients"].items()
+            ]
+        )
+        for ingredient, needed in recipe["ingredients"].items():
+            self.take(ingredient, needed * times)
+        self.add_item(name, recipe["count"] * times)
+        if times == count:
+            self.chat(f"I did the recipe for {name} {count} times")
+        else:
+            self.chat(f"I cannot do the recipe for {name} {count} times")
+
+    def smelt_item(self, args):
+        item, fuel, count = string_arg(args, 1), string_arg(args, 2), count_arg(args, 3)
+        if item is None or fuel is None:
+            return
+        for name in [item, fuel]:
+            if name not in KNOWN_ITEMS:
+                raise SimError(f"No item named {name}")
+        if "furnace" not in self.placed:
+            raise SimError("No furnace nearby")
+        self.advance(self.WALK_TICKS)
+        smelted = 0
+        # items the fuel put into the furnace during this call can still smelt
+        burning = 0
+        for _ in range(count):
+            if not self.inventory.get(item):
+                self.chat(f"No {item} to smelt in inventory")
+                break
+            if burning < 1:
+                if not self.inventory.get(fuel):
+                    self.chat(f"No {fuel} as fuel in inventory")
+                    break
+                if fuel not in FUELS:
+                    raise SimError(f"{fuel} is not a valid fuel")
+                needed = math.ceil((1 - burning) / FUELS[fuel])
+                if self.inventory[fuel] < needed:
+                    self.chat(f"No {fuel} as fuel in inventory")
+                    break
+                self.add_item(fuel, -needed)
+                burning += needed * FUELS[fuel]
+            if item not in SMELTING:
+                raise SimError(f"{item} is not a valid input")
+            self.add_item(item, -1)
+            burning -= 1
+            self.advance(self.SMELT_TICKS)
+            self.add_item(SMELTING[item], 1)
+            smelted += 1
+        if smelted > 0:
+            self.chat(f"Smelted {smelted} {item}.")
+        else:
+            self.chat(f"Failed to smelt {item}, please check the fuel and input.")
+
+    def place_item(self, args):
+        name = string_arg(args, 1)
+        if name is None:
+            return
+        if name not in KNOWN_ITEMS:
+            raise SimError(f"No item named {name}")
+        if not self.inventory.get(name):
+            self.chat(f"No {name} in inventory")
+            return
+        self.advance(self.PLACE_TICKS)
+        self.add_item(name, -1)
+        self.placed[name] = self.placed.get(name, 0) + 1
+        self.journal.append(name)
+        if name == "chest":
+            x, y, z = (math.floor(self.position[axis]) for axis in "xyz")
+            self.chests[f"({x + len(self.chests) + 1}, {y}, {z})"] = "Unknown"
+        self.chat(f"Placed {name}")
+        self.event("onSave", f"{name}_placed")
+
+    def kill_mob(self, args):
+        mob = string_arg(args, 1)
+        if mob is None:
+            return
+        if mob not in self.entities:
+            self.chat(f"No {mob} nearby, please explore first")
+            return
+        self.advance(self.KILL_TICKS)
+        for item, count in MOBS.get(mob, {}).items():
+            self.add_item(item, count)
+        self.event("onSave", f"{mob}_killed")
+
+    def explore_until(self, args):
+        """
+        Exploring finds the blocks and mobs the callback looks for, taking the
+        explore ticks of the one found first.
+        """
+        max_ticks = count_arg(args, 2, 60) * 20
+        callback = args[3] if len(args) > 3 else ""
+        targets = [
+            word
+            for word in re.findall(r"\w+", callback)
+            if word in BLOCKS or word in MOBS
+        ]
+        if any(target in self.nearby or target in self.entities for target in targets):
+            self.chat("Explore success.")
+            return
+        ticks = min(
+            [self.explore_ticks(target) for target in targets], default=max_ticks + 1
+        )
+        self.advance(min(ticks, max_ticks))
+        self.position["x"] += min(ticks, max_ticks) * self.EXPLORE_SPEED
+        if ticks > max_ticks:
+            self.chat("Max exploration time reached")
+            return
+        for target in targets:
+            if self.explore_ticks(target) != ticks:
+                continue
+            if target in BLOCKS:
+                self.nearby.add(target)
+            else:
+                self.entities[target] = 16.0
+        self.chat("Explore success.")
+
+    def explore_ticks(self, target):
+        return BLOCKS[target]["explore"] if target in BLOCKS else self.EXPLORE_MOB_TICKS
+
+    def deposit_item_into_chest(self, args):
+        if len(args) < 3:
+            return
+        match = VEC3_PATTERN.search(args[1])
+        if match:
+            key = f"({match.group(1)}, {match.group(2)}, {match.group(3)})"
+        else:
+            key = next(reversed(self.chests), None)
+        if key not in self.chests:
+            raise SimError(f"No chest at {key}, it is air")
+        self.advance(self.WALK_TICKS)
+        contents = self.chests[key] if isinstance(self.chests[key], dict) else {}
+        for name, count in re.findall(r"[\"']?(\w+)[\"']?\s*:\s*(\d+)", args[2]):
+            if name not in KNOWN_ITEMS:
+                self.chat(f"No item named {name}")
+            elif not self.inventory.get(name):
+                self.chat(f"No {name} in inventory")
+            elif self.inventory[name] < int(count):
+                self.chat(f"Not enough {name} in inventory.")
+            else:
+                self.add_item(name, -int(count))
+                contents[name] = contents.get(name, 0) + int(count)
+        self.chests[key] = contents
+
+
+class SimEnv(gym.Env):
+    """
+    VoyagerEnv without Minecraft: reset and step return the events mineflayer
+    would, computed by SimWorld from recipe and block tables, at thousands of
+    steps per second. The observers and events of an observation profile are
+    honored, delta encoding and step budgets are not.
+    """
+
+    def __init__(self, bot_name="bot", biome="plains", observation_profile=None):
+        """
+        :param bot_name: name of the simulated bot
+        :param biome: biome of the world, one of sim_data.BIOMES
+        :param observation_profile: default observation profile, see VoyagerEnv.build_step_data
+        """
+        if biome not in BIOMES:
+            raise ValueError(f"biome must be one of {', '.join(BIOMES)}")
+        self.bot_name = bot_name
+        self.world = SimWorld(bot_name, biome)
+        self.observation_profile = observation_profile
+        self.has_reset = False
+        self.reset_options = None
+        self.last_metadata = None
+        self.step_setup_ms = None
+
+    def render(self):
+        raise NotImplementedError("render is not implemented")
+
+    def reset(self, *, seed=None, options=None):
+        if options is None:
+            options = {}
+        if options.get("inventory", {}) and options.get("mode", "hard") != "hard":
+            raise RuntimeError("inventory can only be set when options is hard")
+        self.reset_options = {
+            "reset": options.get("mode", "hard"),
+            "inventory": options.get("inventory", {}),
+            "equipment": options.get("equipment", []),
+            "position": options.get("position", None),
+            "time": options.get("time", None),
+            "bot_name": options.get("bot_name", self.bot_name),
+            "observation": options.get("observation", self.observation_profile),
+        }
+        self.bot_name = self.world.bot_name = self.reset_options["bot_name"]
+        self.world.reset(self.reset_options)
+        self.world.default_profile = self.reset_options["observation"] or {}
+        self.world.set_profile()
+        self.has_reset = True
+        return self.world.take_events()
+
+    def step(
+        self,
+        code: str,
+        programs: Union[str, List[str]] = "",
+        observation: Dict[str, Any] = None,
+        movements: Dict[str, Any] = None,
+    ):
+        if not self.has_reset:
+            raise RuntimeError("Environment has not been reset yet")
+        if not isinstance(programs, str):
+            programs = "\n\n".join(programs)
+        self.world.set_profile(observation)
+        self.world.run(code, programs)
+        return self.world.take_events()
+
+    def rollback_placed(self, observation: Dict[str, Any] = None):
+        if not self.has_reset:
+            raise RuntimeError("Environment has not been reset yet")
+        self.world.set_profile(
+            {"observers": ["inventory", "voxels"], "events": [], **(observation or {})}
+        )
+        self.world.rollback()
+        return self.world.take_events()
+
+    def close(self):
+        return True
+
+    async def areset(self, *, seed=None, options=None):
+        return self.reset(seed=seed, options=options)
+
+    async def astep(
+        self,
+        code: str,
+        programs: Union[str, List[str]] = "",
+        observation: Dict[str, Any] = None,
+        movements: Dict[str, Any] = None,
+    ):
+        return self.step(code, programs, observation, movements)
+
+    async def arollback_placed(self, observation: Dict[str, Any] = None):
+        return self.rollback_placed(observation)
+
+    async def aclose(self):
+        return self.close()
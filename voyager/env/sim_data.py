@@ -0,0 +1,232 @@
+"""
+Recipe, block and mob tables of the crafting simulator in sim.py, covering the
+items of the early and mid game that curriculum tasks ask for.
+Ingredients starting with "#" stand for any item of the tag.
+"""
+
+WOODS = ["oak", "spruce", "birch", "jungle", "acacia", "dark_oak", "mangrove"]
+
+TAGS = {
+    "planks": [f"{wood}_planks" for wood in WOODS],
+    "logs": [f"{wood}_log" for wood in WOODS],
+    "stone_tool_materials": ["cobblestone", "cobbled_deepslate", "blackstone"],
+    "coals": ["coal", "charcoal"],
+}
+
+
+def _recipe(count, ingredients, table=True):
+    return {"count": count, "ingredients": ingredients, "table": table}
+
+
+# tool material -> ingredient
+TOOL_MATERIALS = {
+    "wooden": "#planks",
+    "stone": "#stone_tool_materials",
+    "iron": "iron_ingot",
+    "golden": "gold_ingot",
+    "diamond": "diamond",
+}
+# tool kind -> material count, stick count
+TOOL_SHAPES = {
+    "pickaxe": (3, 2),
+    "axe": (3, 2),
+    "shovel": (1, 2),
+    "sword": (2, 1),
+    "hoe": (2, 2),
+}
+ARMOR_SHAPES = {"helmet": 5, "chestplate": 8, "leggings": 7, "boots": 4}
+
+# item -> recipes, tried in order
+RECIPES = {
+    **{
+        f"{wood}_planks": [_recipe(4, {f"{wood}_log": 1}, table=False)]
+        for wood in WOODS
+    },
+    **{
+        f"{material}_{kind}": [_recipe(1, {ingredient: count, "stick": sticks})]
+        for material, ingredient in TOOL_MATERIALS.items()
+        for kind, (count, sticks) in TOOL_SHAPES.items()
+    },
+    **{
+        f"{material}_{piece}": [_recipe(1, {ingredient: count})]
+        for material, ingredient in [
+            ("leather", "leather"),
+            ("iron", "iron_ingot"),
+            ("golden", "gold_ingot"),
+            ("diamond", "diamond"),
+        ]
+        for piece, count in ARMOR_SHAPES.items()
+    },
+    "stick": [_recipe(4, {"#planks": 2}, table=False)],
+    "crafting_table": [_recipe(1, {"#planks": 4}, table=False)],
+    "furnace": [_recipe(1, {"#stone_tool_materials": 8})],
+    "chest": [_recipe(1, {"#planks": 8})],
+    "torch": [_recipe(4, {"#coals": 1, "stick": 1}, table=False)],
+    "campfire": [_recipe(1, {"stick": 3, "#coals": 1, "#logs": 3})],
+    "bucket": [_recipe(1, {"iron_ingot": 3})],
+    "shield": [_recipe(1, {"#planks": 6, "iron_ingot": 1})],
+    "shears": [_recipe(1, {"iron_ingot": 2}, table=False)],
+    "flint_and_steel": [_recipe(1, {"iron_ingot": 1, "flint": 1}, table=False)],
+    "compass": [_recipe(1, {"iron_ingot": 4, "redstone": 1})],
+    "clock": [_recipe(1, {"gold_ingot": 4, "redstone": 1})],
+    "iron_bars": [_recipe(16, {"iron_ingot": 6})],
+    "iron_nugget": [_recipe(9, {"iron_ingot": 1}, table=False)],
+    "iron_block": [_recipe(1, {"iron_ingot": 9})],
+    "iron_ingot": [
+        _recipe(9, {"iron_block": 1}, table=False),
+        _recipe(1, {"iron_nugget": 9}),
+    ],
+    "bow": [_recipe(1, {"stick": 3, "string": 3})],
+    "arrow": [_recipe(4, {"flint": 1, "stick": 1, "feather": 1})],
+    "fishing_rod": [_recipe(1, {"stick": 3, "string": 2})],
+    "bowl": [_recipe(4, {"#planks": 3})],
+    "ladder": [_recipe(3, {"stick": 7})],
+    "oak_door": [_recipe(3, {"oak_planks": 6})],
+    "oak_fence": [_recipe(3, {"oak_planks": 4, "stick": 2})],
+    "oak_slab": [_recipe(6, {"oak_planks": 3})],
+    "oak_stairs": [_recipe(4, {"oak_planks": 6})],
+    "oak_boat": [_recipe(1, {"oak_planks": 5})],
+    "cobblestone_slab": [_recipe(6, {"cobblestone": 3})],
+    "cobblestone_stairs": [_recipe(4, {"cobblestone": 6})],
+    "stone_bricks": [_recipe(4, {"stone": 4}, table=False)],
+    "white_wool": [_recipe(1, {"string": 4}, table=False)],
+    "white_bed": [_recipe(1, {"white_wool": 3, "#planks": 3})],
+    "bread": [_recipe(1, {"wheat": 3})],
+    "paper": [_recipe(3, {"sugar_cane": 3})],
+    "book": [_recipe(1, {"paper": 3, "leather": 1}, table=False)],
+    "glass_bottle": [_recipe(3, {"glass": 3})],
+    "glass_pane": [_recipe(16, {"glass": 6})],
+}
+
+# input -> output of one smelt
+SMELTING = {
+    "raw_iron": "iron_ingot",
+    "raw_gold": "gold_ingot",
+    "raw_copper": "copper_ingot",
+    "iron_ore": "iron_ingot",
+    "gold_ore": "gold_ingot",
+    "sand": "glass",
+    "cobblestone": "stone",
+    "stone": "smooth_stone",
+    "clay_ball": "brick",
+    "cactus": "green_dye",
+    "kelp": "dried_kelp",
+    "beef": "cooked_beef",
+    "porkchop": "cooked_porkchop",
+    "chicken": "cooked_chicken",
+    "mutton": "cooked_mutton",
+    "rabbit": "cooked_rabbit",
+    "cod": "cooked_cod",
+    "salmon": "cooked_salmon",
+    "potato": "baked_potato",
+    **{log: "charcoal" for log in TAGS["logs"]},
+}
+
+# fuel -> items smelted per fuel item
+FUELS = {
+    "coal": 8,
+    "charcoal": 8,
+    "coal_block": 80,
+    "lava_bucket": 100,
+    "blaze_rod": 12,
+    "stick": 0.5,
+    "crafting_table": 1.5,
+    "chest": 1.5,
+    **{planks: 1.5 for planks in TAGS["planks"]},
+    **{log: 1.5 for log in TAGS["logs"]},
+    **{f"wooden_{kind}": 1 for kind in TOOL_SHAPES},
+}
+
+# harvest level of each tool material, and its dig speed multiplier
+TOOL_TIERS = {"wooden": 0, "golden": 0, "stone": 1, "iron": 2, "diamond": 3}
+TOOL_SPEEDS = {"wooden": 2, "stone": 4, "iron": 6, "diamond": 8, "golden": 12}
+
+
+def _block(drop, hardness, tool=None, tier=None, count=1, explore=200):
+    return {
+        "drop": drop,
+        "count": count,
+        "hardness": hardness,
+        # tool that digs the block faster, and the tier it needs to drop anything
+        "tool": tool,
+        "tier": tier,
+        # ticks exploreUntil takes to find the block
+        "explore": explore,
+    }
+
+
+BLOCKS = {
+    **{log: _block(log, 2, "axe") for log in TAGS["logs"]},
+    **{f"{wood}_leaves": _block(None, 0.2, "hoe") for wood in WOODS},
+    **{planks: _block(planks, 2, "axe") for planks in TAGS["planks"]},
+    "grass_block": _block("dirt", 0.6, "shovel"),
+    "dirt": _block("dirt", 0.5, "shovel"),
+    "sand": _block("sand", 0.5, "shovel"),
+    "gravel": _block("gravel", 0.6, "shovel"),
+    "clay": _block("clay_ball", 0.6, "shovel", count=4, explore=600),
+    "snow_block": _block("snowball", 0.2, "shovel", count=4, explore=600),
+    "grass": _block(None, 0),
+    "dead_bush": _block("stick", 0),
+    "sugar_cane": _block("sugar_cane", 0, explore=400),
+    "cactus": _block("cactus", 0.4),
+    "pumpkin": _block("pumpkin", 1, "axe", explore=600),
+    "melon": _block("melon_slice", 1, "axe", count=5, explore=600),
+    "stone": _block("cobblestone", 1.5, "pickaxe", 0),
+    "cobblestone": _block("cobblestone", 2, "pickaxe", 0),
+    "andesite": _block("andesite", 1.5, "pickaxe", 0),
+    "diorite": _block("diorite", 1.5, "pickaxe", 0),
+    "granite": _block("granite", 1.5, "pickaxe", 0),
+    "sandstone": _block("sandstone", 0.8, "pickaxe", 0),
+    "deepslate": _block("cobbled_deepslate", 3, "pickaxe", 0, explore=400),
+    "coal_ore": _block("coal", 3, "pickaxe", 0),
+    "copper_ore": _block("raw_copper", 3, "pickaxe", 1, count=3, explore=400),
+    "iron_ore": _block("raw_iron", 3, "pickaxe", 1, explore=600),
+    "lapis_ore": _block("lapis_lazuli", 3, "pickaxe", 1, count=6, explore=1200),
+    "gold_ore": _block("raw_gold", 3, "pickaxe", 2, explore=1200),
+    "redstone_ore": _block("redstone", 3, "pickaxe", 2, count=4, explore=1200),
+    "diamond_ore": _block("diamond", 3, "pickaxe", 2, explore=2400),
+    "emerald_ore": _block("emerald", 3, "pickaxe", 2, explore=2400),
+    "obsidian": _block("obsidian", 50, "pickaxe", 3, explore=2400),
+    "crafting_table": _block("crafting_table", 2.5, "axe"),
+    "furnace": _block("furnace", 3.5, "pickaxe", 0),
+    "chest": _block("chest", 2.5, "axe"),
+}
+
+# mob -> items dropped when killed
+MOBS = {
+    "pig": {"porkchop": 1},
+    "cow": {"beef": 1, "leather": 1},
+    "sheep": {"mutton": 1, "white_wool": 1},
+    "chicken": {"chicken": 1, "feather": 1},
+    "rabbit": {"rabbit": 1, "rabbit_hide": 1},
+    "zombie": {"rotten_flesh": 1},
+    "skeleton": {"bone": 1, "arrow": 1},
+    "spider": {"string": 1},
+    "creeper": {"gunpowder": 1},
+    "enderman": {"ender_pearl": 1},
+    "slime": {"slime_ball": 1},
+}
+
+# what is around the bot after a hard reset, mob distances in blocks
+BIOMES = {
+    "plains": {
+        "blocks": ["grass_block", "dirt", "stone", "oak_log", "oak_leaves", "grass"],
+        "entities": {"pig": 14.2, "cow": 22.5, "sheep": 18.1, "chicken": 9.8},
+    },
+    "forest": {
+        "blocks": [
+            "grass_block",
+            "dirt",
+            "stone",
+            "oak_log",
+            "oak_leaves",
+            "birch_log",
+            "birch_leaves",
+        ],
+        "entities": {"pig": 19.6, "chicken": 12.3},
+    },
+    "desert": {
+        "blocks": ["sand", "sandstone", "cactus", "dead_bush", "stone"],
+        "entities": {"rabbit": 16.4},
+    },
+}
@@ -0,0 +1,54 @@
+import socket
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+
+
+class UnixHTTPConnection(HTTPConnection):
+    def __init__(self, *args, socket_path, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        return sock
+
+
+class UnixHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = UnixHTTPConnection
+
+    def __init__(self, socket_path, **kwargs):
+        super().__init__("localhost", socket_path=socket_path, **kwargs)
+
+
+class UnixSocketAdapter(HTTPAdapter):
+    """
+    Sends every request of the session it is mounted on to the HTTP server
+    listening on socket_path, keeping connections alive between requests.
+    """
+
+    def __init__(self, socket_path, pool_maxsize=4, **kwargs):
+        self.socket_path = socket_path
+        self.unix_pool_maxsize = pool_maxsize
+        self.unix_pool = None
+        super().__init__(**kwargs)
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        return self.get_connection(request.url, proxies)
+
+    def get_connection(self, url, proxies=None):
+        if self.unix_pool is None:
+            self.unix_pool = UnixHTTPConnectionPool(
+                self.socket_path, maxsize=self.unix_pool_maxsize
+            )
+        return self.unix_pool
+
+    def close(self):
+        super().close()
+        if self.unix_pool is not None:
+            self.unix_pool.close()
+            self.unix_pool = None
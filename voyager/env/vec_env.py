@@ -0,0 +1,145 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import voyager.utils as U
+
+from .bridge import VoyagerEnv
+
+
+class VoyagerVecEnv:
+    """
+    A pool of VoyagerEnv instances, each with its own bot name and, unless they share
+    one bridge, its own mineflayer port (server_port + index) or unix socket
+    (server_socket.index).
+    reset/step run on all envs concurrently; step_as_completed yields each result as soon
+    as its env finishes.
+
+    Minecraft's /pause toggles the whole server, and a bridge only knows the pause state
+    of the bots it hosts. Envs on separate bridges therefore need one Minecraft server
+    each (mc_port as a list, one port per env); envs on the same server have to share a
+    bridge (shared_bridge=True, with the bridge already running on server_port).
+    """
+
+    def __init__(
+        self,
+        num_envs,
+        mc_port=None,
+        azure_login=None,
+        server_host="http://127.0.0.1",
+        server_port=3000,
+        request_timeout=600,
+        log_path="./logs",
+        bot_name_prefix="bot",
+        shared_bridge=False,
+        server_socket=None,
+        **env_kwargs,
+    ):
+        self.num_envs = num_envs
+        if isinstance(mc_port, (list, tuple)):
+            mc_ports = list(mc_port)
+        else:
+            mc_ports = [mc_port] * num_envs
+        assert len(mc_ports) == num_envs, "mc_port must be given for every env"
+        if mc_port and not shared_bridge and len(set(mc_ports)) < num_envs:
+            raise ValueError(
+                "Envs with their own bridge pause each other on a shared Minecraft "
+                "server, give one mc_port per env or use shared_bridge=True"
+            )
+        self.bot_names = [f"{bot_name_prefix}_{i}" for i in range(num_envs)]
+        self.envs = [
+            VoyagerEnv(
+                mc_port=mc_ports[i],
+                azure_login=azure_login,
+                server_host=server_host,
+                server_port=server_port if shared_bridge else server_port + i,
+                request_timeout=request_timeout,
+                log_path=U.f_join(log_path, bot_name),
+                bot_name=bot_name,
+                shared_bridge=shared_bridge,
+                server_socket=(
+                    f"{server_socket}.{i}"
+                    if server_socket and not shared_bridge
+                    else server_socket
+                ),
+                **env_kwargs,
+            )
+            for i, bot_name in enumerate(self.bot_names)
+        ]
+        self.executor = ThreadPoolExecutor(max_workers=num_envs)
+
+    def __len__(self):
+        return self.num_envs
+
+    def _submit(self, fn_per_env: Dict[int, Any]):
+        return {self.executor.submit(fn): i for i, fn in fn_per_env.items()}
+
+    def _per_env_options(self, options):
+        if options is None or isinstance(options, dict):
+            options = [options] * self.num_envs
+        assert len(options) == self.num_envs, "options must be given for every env"
+        return options
+
+    def reset_as_completed(
+        self, *, options: Union[Dict, List[Optional[Dict]], None] = None
+    ) -> Iterator[Tuple[int, Any]]:
+        options = self._per_env_options(options)
+        futures = self._submit(
+            {
+                i: (
+                    lambda env=env, env_options=env_options: env.reset(
+                        options=dict(env_options or {}, bot_name=env.bot_name)
+                    )
+                )
+                for i, (env, env_options) in enumerate(zip(self.envs, options))
+            }
+        )
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    def reset(self, *, options: Union[Dict, List[Optional[Dict]], None] = None):
+        """
+        :param options: reset options shared by all envs, or one dict per env
+        :return: the first observation of every env, in env order
+        """
+        results = [None] * self.num_envs
+        for i, events in self.reset_as_completed(options=options):
+            results[i] = events
+        return results
+
+    def step_as_completed(
+        self,
+        codes: List[Optional[str]],
+        programs: Union[str, List[str]] = "",
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Step every env whose code is not None and yield (env index, events)
+        in the order the envs finish.
+        """
+        assert len(codes) == self.num_envs, "codes must be given for every env"
+        futures = self._submit(
+            {
+                i: (lambda env=env, code=code: env.step(code, programs=programs))
+                for i, (env, code) in enumerate(zip(self.envs, codes))
+                if code is not None
+            }
+        )
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    def step(
+        self,
+        codes: List[Optional[str]],
+        programs: Union[str, List[str]] = "",
+    ):
+        """
+        :return: events of every env in env order, None for envs that were not stepped
+        """
+        results = [None] * self.num_envs
+        for i, events in self.step_as_completed(codes, programs=programs):
+            results[i] = events
+        return results
+
+    def close(self):
+        closed = list(self.executor.map(lambda env: env.close(), self.envs))
+        self.executor.shutdown()
+        return all(closed)
@@ -1,3 +1,4 @@
 from .file_utils import *
 from .json_utils import *
+from .event_utils import DeltaEvents, decode_events, encode_events
 from .record_utils import EventRecorder
@@ -0,0 +1,90 @@
+import copy
+from collections.abc import Sequence
+
+
+def is_delta_encoded(events):
+    return (
+        isinstance(events, list)
+        and len(events) > 1
+        and isinstance(events[0][1], dict)
+        and "$delta" in events[0][1]
+    )
+
+
+def apply_delta(snapshot, ops):
+    """
+    Rebuild an event from the snapshot of the event that follows it.
+    Each op is [path, value] to set a value or [path] to delete a key.
+    """
+    event = copy.deepcopy(snapshot)
+    for op in ops:
+        path = op[0]
+        parent = event
+        for key in path[:-1]:
+            parent = parent.setdefault(key, {})
+        if len(op) > 1:
+            parent[path[-1]] = op[1]
+        else:
+            parent.pop(path[-1], None)
+    return event
+
+
+class DeltaEvents(Sequence):
+    """
+    Events as sent by mineflayer with the delta observation profile: the last event is
+    a full snapshot and every other event a diff against the event after it.
+    Full events are only rebuilt when they are accessed.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        # rebuilt snapshots, kept apart from the events handed out so that callers
+        # can modify those without affecting later reconstructions
+        self._snapshots = {len(raw) - 1: copy.deepcopy(raw[-1][1])}
+        self._events = {len(raw) - 1: raw[-1]}
+
+    def __len__(self):
+        return len(self.raw)
+
+    def _snapshot(self, index):
+        known = min(i for i in self._snapshots if i >= index)
+        snapshot = self._snapshots[known]
+        for i in range(known - 1, index - 1, -1):
+            snapshot = apply_delta(snapshot, self.raw[i][1]["$delta"])
+            self._snapshots[i] = snapshot
+        return snapshot
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("event index out of range")
+        if index not in self._events:
+            self._events[index] = [
+                self.raw[index][0],
+                copy.deepcopy(self._snapshot(index)),
+            ]
+        return self._events[index]
+
+    def __repr__(self):
+        return f"DeltaEvents({len(self)} events)"
+
+
+def decode_events(events):
+    """
+    :return: events as a sequence of full events, whatever encoding they came in
+    """
+    if is_delta_encoded(events):
+        return DeltaEvents(events)
+    return events
+
+
+def encode_events(events):
+    """
+    :return: the raw, json serializable form of events
+    """
+    if isinstance(events, DeltaEvents):
+        return events.raw
+    return events
@@ -2,6 +2,23 @@ import time
 
 from .file_utils import *
 from .json_utils import *
+from .event_utils import decode_events, encode_events
+
+
+def record_timestamp(record):
+    timestamp = "_".join(record.split("_")[-2:])
+    return time.mktime(time.strptime(timestamp, "%Y%m%d_%H%M%S"))
+
+
+def record_task(record):
+    return "_".join(record.split("_")[:-2])
+
+
+def sorted_records(ckpt_dir):
+    """
+    :return: names of the recorded steps under ckpt_dir/events, oldest first
+    """
+    return sorted(f_listdir(ckpt_dir, "events"), key=record_timestamp)
 
 
 class EventRecorder:
@@ -20,21 +37,21 @@ class EventRecorder:
         self.position_history = [[0, 0]]
         self.elapsed_time = 0
         self.iteration = 0
+        # mineflayer timing summed over all recorded steps
+        self.timing = {"phases": {}, "primitives": {}, "waits": {}}
         f_mkdir(self.ckpt_dir, "events")
+        f_mkdir(self.ckpt_dir, "code")
         if resume:
             self.resume()
 
-    def record(self, events, task):
+    def record(self, events, task, metadata=None, code=None):
         task = re.sub(r'[\\/:"*?<>| ]', "_", task)
         task = task.replace(" ", "_") + time.strftime(
             "_%Y%m%d_%H%M%S", time.localtime()
         )
         self.iteration += 1
         if not self.init_position:
-            self.init_position = [
-                events[0][1]["status"]["position"]["x"],
-                events[0][1]["status"]["position"]["z"],
-            ]
+            self.init_position = self.first_position(events)
         for event_type, event in events:
             self.update_items(event)
             if event_type == "observe":
@@ -43,7 +60,13 @@ class EventRecorder:
             f"\033[96m****Recorder message: {self.elapsed_time} ticks have elapsed****\033[0m\n"
             f"\033[96m****Recorder message: {self.iteration} iteration passed****\033[0m"
         )
-        dump_json(events, f_join(self.ckpt_dir, "events", task))
+        dump_json(encode_events(events), f_join(self.ckpt_dir, "events", task))
+        # the code that produced the events, for replaying the step, see ReplayEnv
+        if code is not None:
+            dump_text(code, f_join(self.ckpt_dir, "code", task))
+        if metadata:
+            self.update_timing(metadata)
+            dump_json(self.timing, f_join(self.ckpt_dir, "timing.json"))
 
     def resume(self, cutoff=None):
         self.item_history = set()
@@ -51,30 +74,38 @@ class EventRecorder:
         self.item_vs_iter = {}
         self.elapsed_time = 0
         self.position_history = [[0, 0]]
+        if f_exists(self.ckpt_dir, "timing.json"):
+            self.timing = load_json(f_join(self.ckpt_dir, "timing.json"))
 
-        def get_timestamp(string):
-            timestamp = "_".join(string.split("_")[-2:])
-            return time.mktime(time.strptime(timestamp, "%Y%m%d_%H%M%S"))
-
-        records = f_listdir(self.ckpt_dir, "events")
-        sorted_records = sorted(records, key=get_timestamp)
-        for record in sorted_records:
+        for record in sorted_records(self.ckpt_dir):
             self.iteration += 1
             if cutoff and self.iteration > cutoff:
                 break
-            events = load_json(f_join(self.ckpt_dir, "events", record))
+            events = decode_events(
+                load_json(f_join(self.ckpt_dir, "events", record))
+            )
             if not self.init_position:
-                self.init_position = (
-                    events[0][1]["status"]["position"]["x"],
-                    events[0][1]["status"]["position"]["z"],
-                )
+                self.init_position = self.first_position(events)
             for event_type, event in events:
                 self.update_items(event)
                 self.update_position(event)
                 if event_type == "observe":
                     self.update_elapsed_time(event)
 
+    @staticmethod
+    def first_position(events):
+        # events recorded with an observation profile may leave out the status
+        for _, event in events:
+            if "status" in event:
+                return [
+                    event["status"]["position"]["x"],
+                    event["status"]["position"]["z"],
+                ]
+        return None
+
     def update_items(self, event):
+        if "inventory" not in event or "status" not in event:
+            return
         inventory = event["inventory"]
         elapsed_time = event["status"]["elapsedTime"]
         biome = event["status"]["biome"]
@@ -90,10 +121,39 @@ class EventRecorder:
                 self.item_vs_iter[self.iteration] = []
             self.item_vs_iter[self.iteration].extend(new_items)
 
+    def update_timing(self, metadata):
+        for group in ["phases", "primitives"]:
+            for name, stats in metadata.get(group, {}).items():
+                total = self.timing[group].setdefault(name, {"calls": 0})
+                # phases happen once per step, primitives report their calls
+                total["calls"] += stats.get("calls", 1)
+                for key, value in stats.items():
+                    if key != "calls":
+                        total[key] = total.get(key, 0) + value
+        # adaptive waits, saved_ticks is what fixed waitTicks waits would have cost more
+        waits = self.timing.setdefault("waits", {})
+        for key, value in metadata.get("waits", {}).items():
+            waits[key] = waits.get(key, 0) + value
+
+    def hot_primitives(self, n=5):
+        """
+        :return: the n primitives with the most wall time across recorded steps
+        """
+        primitives = sorted(
+            self.timing["primitives"].items(),
+            key=lambda item: item[1].get("ms", 0),
+            reverse=True,
+        )
+        return primitives[:n]
+
     def update_elapsed_time(self, event):
+        if "status" not in event:
+            return
         self.elapsed_time += event["status"]["elapsedTime"]
 
     def update_position(self, event):
+        if "status" not in event or not self.init_position:
+            return
         position = [
             event["status"]["position"]["x"] - self.init_position[0],
             event["status"]["position"]["z"] - self.init_position[1],
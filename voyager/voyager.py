@@ -1,10 +1,11 @@
+import asyncio
+import concurrent.futures
 import copy
 import os
-import time
 from typing import Dict
 
 import voyager.utils as u
-from .env import VoyagerEnv
+from .env import AsyncVoyagerEnv, ReplayDivergence
 
 from .agents import ActionAgent
 from .agents import CriticAgent
@@ -22,6 +23,16 @@ class Voyager:
         openai_api_key: str = None,
         env_wait_ticks: int = 20,
         env_request_timeout: int = 600,
+        env_use_msgpack: bool = False,
+        env_shared_bridge: bool = False,
+        env_step_max_ticks: int = None,
+        env_step_max_seconds: float = None,
+        env_standby_port: int = None,
+        env_observation_profile: Dict = None,
+        env_collect_metadata: bool = False,
+        env_mock_bridge: bool = False,
+        env_server_socket: str = None,
+        env=None,
         max_iterations: int = 3160,
         reset_placed_if_failed: bool = False,
         action_agent_model_name: str = "gpt-4o",
@@ -63,6 +74,23 @@ class Voyager:
         you should increase this value
         :param env_request_timeout: how many seconds to wait for each step, if the code execution exceeds this time,
         python side will terminate the connection and need to be resumed
+        :param env_use_msgpack: whether to receive observations from mineflayer as msgpack instead of json
+        :param env_shared_bridge: attach to a mineflayer bridge already running on server_port that hosts
+        other bots as well, instead of starting a node process for this agent
+        :param env_step_max_ticks: game ticks a step's program may run before mineflayer aborts it, None for no limit
+        :param env_step_max_seconds: seconds a step's program may run before mineflayer aborts it and returns
+        the observation, defaults to 90% of env_request_timeout
+        :param env_standby_port: port of a standby mineflayer process that is kept booted and takes over
+        when the main one dies, None to restart the process instead
+        :param env_observation_profile: default observation profile of the bot, e.g. {"delta": True} to receive
+        and record diff encoded events, see VoyagerEnv.build_step_data
+        :param env_collect_metadata: whether mineflayer reports per phase and per primitive timing of each step,
+        summed up in ckpt_dir/timing.json
+        :param env_mock_bridge: whether to run against the scripted world of env/mock_bridge.py instead of
+        mineflayer and Minecraft, for benchmarking the agent loop
+        :param env_server_socket: path of a unix domain socket for mineflayer to listen on instead of server_port
+        :param env: environment to use instead of creating one from the env_* parameters, e.g. a SimEnv, or a
+        ReplayEnv over the checkpoint of an earlier run, whose ckpt_dir should then differ from this run's
         :param reset_placed_if_failed: whether to reset placed blocks if failed, useful for building task
         :param action_agent_model_name: action agent model name
         :param action_agent_temperature: action agent temperature
@@ -102,16 +130,30 @@ class Voyager:
         """
         ckpt_dir = ckpt_dir + "/" + bot_name
         # init env
-        self.env = VoyagerEnv(
-            mc_port=mc_port,
-            azure_login=azure_login,
-            server_port=server_port,
-            request_timeout=env_request_timeout,
-        )
+        if env is not None:
+            self.env = env
+        else:
+            self.env = AsyncVoyagerEnv(
+                mc_port=mc_port,
+                azure_login=azure_login,
+                server_port=server_port,
+                request_timeout=env_request_timeout,
+                use_msgpack=env_use_msgpack,
+                bot_name=bot_name,
+                shared_bridge=env_shared_bridge,
+                step_max_ticks=env_step_max_ticks,
+                step_max_seconds=env_step_max_seconds,
+                standby_port=env_standby_port,
+                observation_profile=env_observation_profile,
+                collect_metadata=env_collect_metadata,
+                mock_bridge=env_mock_bridge,
+                server_socket=env_server_socket,
+            )
         self.env_wait_ticks = env_wait_ticks
         self.reset_placed_if_failed = reset_placed_if_failed
         self.max_iterations = max_iterations
         self.bot_name = bot_name
+        self.loop = asyncio.new_event_loop()
 
         # set openai api key
         os.environ["OPENAI_API_KEY"] = openai_api_key
@@ -164,27 +206,52 @@ class Voyager:
         self.conversations = []
         self.last_events = None
 
+    def run(self, coroutine):
+        # the synchronous API drives the async loop on a private event loop
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self.loop.run_until_complete(coroutine)
+        # a loop already runs in this thread (Jupyter, an async host) and the
+        # private one cannot run inside it, so it runs in a worker thread
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(self.loop.run_until_complete, coroutine).result()
+
     def reset(self, task, context="", reset_env=True):
+        return self.run(self.areset(task=task, context=context, reset_env=reset_env))
+
+    async def areset(self, task, context="", reset_env=True):
         self.action_agent_rollout_num_iter = 0
         self.task = task
         self.context = context
-        if reset_env:
-            self.env.reset(
-                options={
-                    "mode": "soft",
-                    "wait_ticks": self.env_wait_ticks,
-                    "bot_name": self.bot_name
-                }
-            )
+
         difficulty = (
             "easy" if len(self.curriculum_agent.completed_tasks) > 15 else "peaceful"
         )
-        # step to peek an observation
-        events = self.env.step(
-            "bot.chat(`/time set ${getNextTime()}`);\n"
-            + f"bot.chat('/difficulty {difficulty}');"
+
+        async def peek_observation():
+            if reset_env:
+                # the reset sets up the world and observes it in one round trip
+                return await self.env.areset(
+                    options={
+                        "mode": "soft",
+                        "wait_ticks": self.env_wait_ticks,
+                        "bot_name": self.bot_name,
+                        "time": "next",
+                        "difficulty": difficulty,
+                    }
+                )
+            # step to peek an observation
+            return await self.env.astep(
+                "bot.chat(`/time set ${getNextTime()}`);\n"
+                + f"bot.chat('/difficulty {difficulty}');"
+            )
+
+        # skill retrieval only depends on the context, run it while the env resets
+        events, skills = await asyncio.gather(
+            peek_observation(),
+            asyncio.to_thread(self.skill_manager.retrieve_skills, query=self.context),
         )
-        skills = self.skill_manager.retrieve_skills(query=self.context)
         print(
             f"\033[33mRender Action Agent system message with {len(skills)} skills\033[0m"
         )
@@ -201,12 +268,16 @@ class Voyager:
         return self.messages
 
     def close(self):
-        self.env.close()
+        self.run(self.env.aclose())
+        self.loop.close()
 
     def step(self):
+        return self.run(self.astep())
+
+    async def astep(self):
         if self.action_agent_rollout_num_iter < 0:
             raise ValueError("Agent must be reset before stepping")
-        ai_message = self.action_agent.llm.invoke(self.messages)
+        ai_message = await self.action_agent.llm.ainvoke(self.messages)
         print(f"\033[34m****Action Agent ai message****\n{ai_message.content}\033[0m")
         self.conversations.append(
             (self.messages[0].content, self.messages[1].content, ai_message.content)
@@ -215,21 +286,40 @@ class Voyager:
         success = False
         if isinstance(parsed_result, dict):
             code = parsed_result["program_code"] + "\n" + parsed_result["exec_code"]
-            events = self.env.step(
+            events = await self.env.astep(
                 code,
-                programs=self.skill_manager.programs,
+                programs=self.skill_manager.program_entries,
+            )
+            self.recorder.record(
+                events, self.task, metadata=self.env.last_metadata, code=code
             )
-            self.recorder.record(events, self.task)
             self.action_agent.update_chest_memory(events[-1][1]["nearbyChests"])
-            success, critique = self.critic_agent.check_task_success(
-                events=events,
-                task=self.task,
-                context=self.context,
-                chest_observation=self.action_agent.render_chest_observation(),
-                max_retries=5,
+            # the next skill retrieval does not depend on the critique
+            (success, critique), new_skills = await asyncio.gather(
+                self.critic_agent.acheck_task_success(
+                    events=events,
+                    task=self.task,
+                    context=self.context,
+                    chest_observation=self.action_agent.render_chest_observation(),
+                    max_retries=5,
+                ),
+                asyncio.to_thread(
+                    self.skill_manager.retrieve_skills,
+                    query=self.context
+                    + "\n\n"
+                    + self.action_agent.summarize_chatlog(events),
+                ),
             )
 
-            if self.reset_placed_if_failed and not success:
+            if self.reset_placed_if_failed and not success and hasattr(
+                self.env, "arollback_placed"
+            ):
+                # the bridge journaled the placements of the step, and takes them
+                # back without running any code
+                new_events = await self.env.arollback_placed()
+                events[-1][1]["inventory"] = new_events[-1][1]["inventory"]
+                events[-1][1]["voxels"] = new_events[-1][1]["voxels"]
+            elif self.reset_placed_if_failed and not success:
                 # revert all the placing event in the last step
                 blocks = []
                 positions = []
@@ -239,17 +329,14 @@ class Voyager:
                         position = event["status"]["position"]
                         blocks.append(block)
                         positions.append(position)
-                new_events = self.env.step(
+                new_events = await self.env.astep(
                     f"await givePlacedItemBack(bot, {u.json_dumps(blocks)}, {u.json_dumps(positions)})",
-                    programs=self.skill_manager.programs,
+                    programs=self.skill_manager.program_entries,
+                    # only the final inventory and voxels are used
+                    observation={"observers": ["inventory", "voxels"], "events": []},
                 )
                 events[-1][1]["inventory"] = new_events[-1][1]["inventory"]
                 events[-1][1]["voxels"] = new_events[-1][1]["voxels"]
-            new_skills = self.skill_manager.retrieve_skills(
-                query=self.context
-                + "\n\n"
-                + self.action_agent.summarize_chatlog(events)
-            )
             system_message = self.action_agent.render_system_message(skills=new_skills)
             human_message = self.action_agent.render_human_message(
                 events=events,
@@ -288,17 +375,23 @@ class Voyager:
         return self.messages, 0, done, info
 
     def rollout(self, *, task, context, reset_env=True):
-        self.reset(task=task, context=context, reset_env=reset_env)
+        return self.run(self.arollout(task=task, context=context, reset_env=reset_env))
+
+    async def arollout(self, *, task, context, reset_env=True):
+        await self.areset(task=task, context=context, reset_env=reset_env)
         while True:
-            messages, reward, done, info = self.step()
+            messages, reward, done, info = await self.astep()
             if done:
                 break
         return messages, reward, done, info
 
     def learn(self, reset_env=True):
+        return self.run(self.alearn(reset_env=reset_env))
+
+    async def alearn(self, reset_env=True):
         if self.resume:
             # keep the inventory
-            self.env.reset(
+            self.last_events = await self.env.areset(
                 options={
                     "mode": "soft",
                     "wait_ticks": self.env_wait_ticks,
@@ -306,20 +399,20 @@ class Voyager:
             )
         else:
             # clear the inventory
-            self.env.reset(
+            self.last_events = await self.env.areset(
                 options={
                     "mode": "hard",
                     "wait_ticks": self.env_wait_ticks,
                 }
             )
             self.resume = True
-        self.last_events = self.env.step("")
 
         while True:
             if self.recorder.iteration > self.max_iterations:
                 print("Iteration limit reached")
                 break
-            task, context = self.curriculum_agent.propose_next_task(
+            task, context = await asyncio.to_thread(
+                self.curriculum_agent.propose_next_task,
                 events=self.last_events,
                 chest_observation=self.action_agent.render_chest_observation(),
                 max_retries=5,
@@ -328,19 +421,22 @@ class Voyager:
                 f"\033[35mStarting task {task} for at most {self.action_agent_task_max_retries} times\033[0m"
             )
             try:
-                messages, reward, done, info = self.rollout(
+                messages, reward, done, info = await self.arollout(
                     task=task,
                     context=context,
                     reset_env=reset_env,
                 )
+            except ReplayDivergence:
+                # a replay without fallback env has nothing to reset and go on in
+                raise
             except Exception as e:
-                time.sleep(3)  # wait for mineflayer to exit
+                await asyncio.sleep(3)  # wait for mineflayer to exit
                 info = {
                     "task": task,
                     "success": False,
                 }
                 # reset bot status here
-                self.last_events = self.env.reset(
+                self.last_events = await self.env.areset(
                     options={
                         "mode": "hard",
                         "wait_ticks": self.env_wait_ticks,
@@ -353,10 +449,16 @@ class Voyager:
                 print("Your last round rollout terminated due to error:")
                 print(f"\033[41m{e}\033[0m")
 
+            # curriculum bookkeeping does not wait for the skill description,
+            # they write separate checkpoints (curriculum/ and skill/)
+            bookkeeping = [
+                asyncio.to_thread(self.curriculum_agent.update_exploration_progress, info)
+            ]
             if info["success"]:
-                self.skill_manager.add_new_skill(info)
-
-            self.curriculum_agent.update_exploration_progress(info)
+                bookkeeping.append(
+                    asyncio.to_thread(self.skill_manager.add_new_skill, info)
+                )
+            await asyncio.gather(*bookkeeping)
             print(
                 f"\033[35mCompleted tasks: {', '.join(self.curriculum_agent.completed_tasks)}\033[0m"
             )
@@ -385,7 +487,7 @@ class Voyager:
             raise ValueError("Either task or sub_goals must be provided")
         if not sub_goals:
             sub_goals = self.decompose_task(task)
-        self.env.reset(
+        self.last_events = self.env.reset(
             options={
                 "mode": reset_mode,
                 "wait_ticks": self.env_wait_ticks,
@@ -393,7 +495,6 @@ class Voyager:
         )
         self.curriculum_agent.completed_tasks = []
         self.curriculum_agent.failed_tasks = []
-        self.last_events = self.env.step("")
         while self.curriculum_agent.progress < len(sub_goals):
             next_task = sub_goals[self.curriculum_agent.progress]
             context = self.curriculum_agent.get_task_context(next_task)